@@ -0,0 +1,222 @@
+"""Local stand-in for every ATS in dispatch_map, serving synthetic boards.
+
+The benchmark rewrites https://<host>/<path> to http://127.0.0.1:<port>/<host>/<path>,
+so this server sees the original host as the first path segment and answers the way the
+real API would. Boards are generated deterministically from the org name, so every run
+of the same configuration serves identical data.
+
+Run standalone with:
+
+    python benchmarks/ats_server.py --port 8765 --jobs 200 --latency 0.05
+"""
+import argparse
+import asyncio
+import random
+import re
+
+from aiohttp import web
+
+TITLES = [
+    'Software Engineer', 'Backend Developer', 'Senior Software Engineer', 'Frontend Engineer',
+    'Staff Infrastructure Engineer', 'Account Executive', 'Product Designer', 'Full Stack Developer',
+    'DevOps Engineer', 'Engineering Manager', 'Cloud Platform Engineer', 'Recruiter', 'Java Developer',
+    'Data Analyst', 'UI Engineer', 'Customer Success Manager',
+]
+LOCATIONS = [
+    ('San Francisco', 'CA'), ('New York', 'NY'), ('Austin', 'TX'), ('Seattle', 'WA'), ('Remote', 'United States'),
+    ('London', 'United Kingdom'), ('Toronto', 'Ontario'), ('Berlin', 'Germany'), ('Bengaluru', 'India'),
+]
+DESCRIPTION = '<p>' + 'We are hiring. ' * 40 + '</p>'
+
+WORKDAY_PAGE_LIMIT = 20
+SMARTRECRUITERS_PAGE_LIMIT = 100
+WORKABLE_PAGE_LIMIT = 50
+
+
+class SyntheticBoards:
+    def __init__(self, jobs_per_board, latency):
+        self.jobs_per_board = jobs_per_board
+        self.latency = latency
+        self.requests = 0
+        self.bytes_sent = 0
+        self._boards = {}
+
+    def board(self, org):
+        jobs = self._boards.get(org)
+        if jobs is None:
+            rng = random.Random(org)
+            jobs = []
+            for i in range(self.jobs_per_board):
+                city, region = rng.choice(LOCATIONS)
+                jobs.append({
+                    'id': f'{org}-{i}',
+                    'title': f'{rng.choice(TITLES)} {i}',
+                    'city': city,
+                    'region': region,
+                    'published': f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00Z',
+                    'epoch_ms': 1735689600000 + i * 3600000,
+                })
+            self._boards[org] = jobs
+        return jobs
+
+    def location(self, job):
+        return f"{job['city']}, {job['region']}"
+
+    # --- Platform handlers: (request, host, path) -> response ---
+
+    def greenhouse(self, request, host, path):
+        org = re.match(r'v1/boards/([^/]+)/jobs', path).group(1)
+        return web.json_response({'jobs': [{
+            'id': job['id'], 'title': job['title'], 'location': {'name': self.location(job)},
+            'absolute_url': f"https://job-boards.greenhouse.io/{org}/jobs/{job['id']}",
+            'first_published': job['published'], 'updated_at': job['published'], 'content': DESCRIPTION,
+        } for job in self.board(org)]})
+
+    def lever(self, request, host, path):
+        org = re.match(r'v0/postings/([^/?]+)', path).group(1)
+        return web.json_response([{
+            'id': job['id'], 'text': job['title'], 'categories': {'location': self.location(job)},
+            'createdAt': job['epoch_ms'], 'updatedAt': job['epoch_ms'],
+            'hostedUrl': f"https://jobs.lever.co/{org}/{job['id']}", 'description': DESCRIPTION,
+        } for job in self.board(org)])
+
+    def ashby(self, request, host, path):
+        org = host.split('.')[1]
+        if path != 'api/jobs':
+            return web.Response(text=f'<html><body>{org} careers</body></html>', content_type='text/html')
+        return web.json_response({'jobs': [
+            {'id': job['id'], 'title': job['title'], 'location': self.location(job)} for job in self.board(org)
+        ]})
+
+    def ashbyhq(self, request, host, path):
+        org = re.match(r'posting-api/job-board/([^/]+)', path).group(1)
+        return web.json_response({'jobs': [{
+            'title': job['title'], 'location': self.location(job), 'publishedAt': job['published'],
+            'jobUrl': f"https://jobs.ashbyhq.com/{org}/{job['id']}",
+        } for job in self.board(org)]})
+
+    async def workable(self, request, host, path):
+        match = re.match(r'api/(v1|v3)/accounts/([^/]+)/jobs', path)
+        version, org = match.groups()
+        jobs = self.board(org)
+        # Orgs named v1-* only answer the legacy endpoint
+        if org.startswith('v1-'):
+            if version == 'v3':
+                return web.json_response({'error': 'not found'}, status=404)
+            return web.json_response([{
+                'title': job['title'], 'location': self.location(job), 'shortcode': job['id'],
+                'published': job['published'],
+            } for job in jobs])
+        body = await request.json()
+        start = int(body.get('token') or 0)
+        page = jobs[start:start + WORKABLE_PAGE_LIMIT]
+        next_start = start + WORKABLE_PAGE_LIMIT
+        return web.json_response({
+            'total': len(jobs),
+            'results': [{
+                'title': job['title'], 'location': {'city': job['city'], 'region': job['region']},
+                'shortcode': job['id'], 'published': job['published'],
+            } for job in page],
+            'nextPage': str(next_start) if next_start < len(jobs) else None,
+        })
+
+    async def workday(self, request, host, path):
+        tenant = host.split('.')[0]
+        body = await request.json()
+        offset = int(body.get('offset', 0))
+        limit = min(int(body.get('limit', WORKDAY_PAGE_LIMIT)), WORKDAY_PAGE_LIMIT)
+        jobs = self.board(tenant)
+        return web.json_response({
+            # Like the real API, only the first page carries the total
+            'total': len(jobs) if offset == 0 else 0,
+            'jobPostings': [{
+                'title': job['title'], 'locationsText': self.location(job), 'postedOn': 'Posted 3 Days Ago',
+                'externalPath': f"/job/{job['city']}/{job['id']}",
+            } for job in jobs[offset:offset + limit]],
+        })
+
+    def breezy(self, request, host, path):
+        org = host.split('.')[0]
+        return web.json_response([{
+            'name': job['title'], 'location': {'name': self.location(job)}, 'published_date': job['published'],
+            'url': f"https://{org}.breezy.hr/p/{job['id']}",
+        } for job in self.board(org)])
+
+    def smartrecruiters(self, request, host, path):
+        org = re.match(r'v1/companies/([^/]+)/postings', path).group(1)
+        offset = int(request.query.get('offset', 0))
+        limit = min(int(request.query.get('limit', SMARTRECRUITERS_PAGE_LIMIT)), SMARTRECRUITERS_PAGE_LIMIT)
+        jobs = self.board(org)
+        return web.json_response({
+            'totalFound': len(jobs), 'offset': offset, 'limit': limit,
+            'content': [{
+                'id': job['id'], 'name': job['title'], 'location': {'city': job['city']},
+                'releasedDate': job['published'],
+            } for job in jobs[offset:offset + limit]],
+        })
+
+    def html(self, request, host, path):
+        # generic careers pages and Recruiterbox: lots of markup around a list of links
+        org = host.split('.')[0]
+        items = ''.join(
+            f"<li><div class='job'><a href='/jobs/{job['id']}'>{job['title']}</a>"
+            f"<span>{self.location(job)}</span></div></li>"
+            for job in self.board(org)
+        )
+        nav = '<nav>' + ''.join(f"<a href='/page/{i}'>Page {i}</a>" for i in range(30)) + '</nav>'
+        return web.Response(text=f'<html><body>{nav}<ul>{items}</ul>{DESCRIPTION * 5}</body></html>',
+                            content_type='text/html')
+
+    def route(self, host):
+        if host == 'boards-api.greenhouse.io':
+            return self.greenhouse
+        if host in ('api.lever.co', 'api.eu.lever.co'):
+            return self.lever
+        if host == 'api.ashbyhq.com':
+            return self.ashbyhq
+        if host == 'apply.workable.com':
+            return self.workable
+        if host == 'api.smartrecruiters.com':
+            return self.smartrecruiters
+        if host.endswith('.myworkdayjobs.com'):
+            return self.workday
+        if host.endswith('.breezy.hr'):
+            return self.breezy
+        if host.startswith('careers.') and host.endswith('.com'):
+            return self.ashby
+        return self.html
+
+    async def handle(self, request):
+        host, _, path = request.match_info['tail'].partition('/')
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.requests += 1
+        response = self.route(host)(request, host, path)
+        if asyncio.iscoroutine(response):
+            response = await response
+        self.bytes_sent += len(response.body or b'')
+        return response
+
+    async def stats(self, request):
+        return web.json_response({'requests': self.requests, 'bytes': self.bytes_sent})
+
+
+def make_app(jobs_per_board, latency):
+    boards = SyntheticBoards(jobs_per_board, latency)
+    app = web.Application()
+    app.router.add_get('/__stats', boards.stats)
+    app.router.add_route('*', '/{tail:.+}', boards.handle)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve synthetic ATS boards for benchmarking.')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--jobs', type=int, default=200, help='postings per board')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    args = parser.parse_args()
+    web.run_app(make_app(args.jobs, args.latency), host='127.0.0.1', port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Micro-benchmark: compiled TitleMatcher vs. the original keyword_match.
+
+Run from the repository root:
+
+    python benchmarks/bench_keyword_match.py [--repeat N]
+
+Titles come from output_old.csv when it exists, otherwise from a small synthetic set.
+"""
+import argparse
+import csv
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from jobscraper.config import KEYWORDS, NO_KEYWORDS, WHOLE_WORD_KEYWORDS  # noqa: E402
+from jobscraper.matching import TitleMatcher  # noqa: E402
+
+SYNTHETIC_TITLES = [
+    'Software Engineer, Backend', 'Senior Software Engineer', 'Build & Release Engineer', 'UI Developer',
+    'Product Designer', 'Staff Frontend Engineer', 'Cloud Infrastructure Engineer', 'Account Executive',
+    'Technical Program Manager', 'Java Developer Co-op', 'Machine Learning Engineer', 'Field Guide Writer',
+]
+
+
+def legacy_keyword_match(title):
+    title_lower = title.lower()
+    has_positive = any(k in title_lower for k in KEYWORDS)
+    has_negative = any(nk in title_lower for nk in NO_KEYWORDS)
+    return has_positive and not has_negative
+
+
+def load_titles():
+    archive = Path('output_old.csv')
+    if not archive.exists():
+        return SYNTHETIC_TITLES * 500
+    with archive.open(newline='', encoding='utf-8') as f:
+        return [row['title'] for row in csv.DictReader(f) if row.get('title')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    titles = load_titles()
+    matcher = TitleMatcher(KEYWORDS, NO_KEYWORDS, WHOLE_WORD_KEYWORDS)
+
+    def run_legacy():
+        for t in titles:
+            legacy_keyword_match(t)
+
+    def run_compiled():
+        for t in titles:
+            matcher.match(t)
+
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=args.repeat))
+    compiled = min(timeit.repeat(run_compiled, number=1, repeat=args.repeat))
+    print(f"titles:   {len(titles)}")
+    print(f"legacy:   {legacy * 1e3:8.2f} ms  ({legacy / len(titles) * 1e6:.2f} us/title)")
+    print(f"compiled: {compiled * 1e3:8.2f} ms  ({compiled / len(titles) * 1e6:.2f} us/title)")
+    print(f"speedup:  {legacy / compiled:.2f}x")
+
+    # Differences are expected only where word-boundary rules apply
+    diffs = [t for t in titles if legacy_keyword_match(t) != matcher.match(t)]
+    print(f"differing verdicts: {len(diffs)}")
+    for t in sorted(set(diffs))[:10]:
+        print(f"  {legacy_keyword_match(t)!s:5} -> {matcher.match(t)!s:5}  {t}")
+
+
+if __name__ == '__main__':
+    main()
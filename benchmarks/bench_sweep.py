@@ -0,0 +1,150 @@
+"""End-to-end sweep benchmark against a local stand-in ATS server (benchmarks/ats_server.py).
+
+Starts the server in a child process, builds N synthetic companies spread over every
+dispatch_map platform, runs a full run_sweep() over them and reports wall time, jobs/sec,
+requests/sec and peak memory. No real job board is contacted.
+
+    python benchmarks/bench_sweep.py --companies 200 --jobs 300 --latency 0.05 --json bench.json
+
+Pass --rate-limits to apply the production RATE_LIMITS (slow: Workday is paced at
+0.5 req/s per tenant); by default only the per-host connection pools limit throughput.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import resource
+import socket
+import sys
+import time
+import tracemalloc
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from jobscraper.pipeline import RecordCollector  # noqa: E402
+from jobscraper.scrapers import RATE_LIMITS, dispatch_map  # noqa: E402
+from jobscraper.sweep import Filters, run_sweep  # noqa: E402
+
+# careers_url for each platform, as they appear in the companies list
+CAREERS_URLS = {
+    'greenhouse': 'https://job-boards.greenhouse.io/{org}',
+    'lever': 'https://jobs.lever.co/{org}',
+    'ashby': 'https://careers.{org}.com/',
+    'ashbyhq_hosted': 'https://jobs.ashbyhq.com/{org}',
+    'workable': 'https://apply.workable.com/{org}/',
+    'workday': 'https://{org}.wd5.myworkdayjobs.com/en-US/External',
+    'generic': 'https://{org}.example.com/careers',
+    'breezy': 'https://{org}.breezy.hr/',
+    'smartrecruiters': 'https://careers.smartrecruiters.com/{org}',
+    'recruiterbox': 'https://{org}.recruiterbox.com/jobs',
+}
+
+
+def synthetic_companies(count):
+    platforms = list(dispatch_map)
+    companies = []
+    for i in range(count):
+        platform = platforms[i % len(platforms)]
+        org = f'bench{i}'
+        # Every other Workable company only has the v1 API, exercising the fallback
+        if platform == 'workable' and (i // len(platforms)) % 2:
+            org = f'v1-{org}'
+        companies.append({'company': org, 'careers_url': CAREERS_URLS[platform].format(org=org),
+                          'platform': platform})
+    return companies
+
+
+def _serve(port, jobs, latency):
+    from aiohttp import web
+
+    from ats_server import make_app
+
+    web.run_app(make_app(jobs, latency), host='127.0.0.1', port=port, print=None)
+
+
+def start_server(jobs, latency):
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    proc = multiprocessing.Process(target=_serve, args=(port, jobs, latency), daemon=True)
+    proc.start()
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return proc, port
+        except OSError:
+            time.sleep(0.05)
+    proc.terminate()
+    raise RuntimeError('ATS stand-in server did not start')
+
+
+def server_stats(port):
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}/__stats') as resp:
+        return json.load(resp)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark a full sweep against synthetic ATS boards.')
+    parser.add_argument('--companies', type=int, default=100)
+    parser.add_argument('--jobs', type=int, default=200, help='postings per board')
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds added to every response')
+    parser.add_argument('--rate-limits', action='store_true', help='apply the production RATE_LIMITS')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='also report the tracemalloc peak (slows the sweep down)')
+    parser.add_argument('--parse-workers', type=int, nargs='?', const=None, default=0, metavar='N',
+                        help='decode large responses in N worker processes (no N: one per CPU)')
+    parser.add_argument('--json', type=Path, help='write the report here as JSON')
+    args = parser.parse_args()
+
+    proc, port = start_server(args.jobs, args.latency)
+    try:
+        companies = synthetic_companies(args.companies)
+        base = f'http://127.0.0.1:{port}/'
+
+        def rewrite_url(url):
+            return base + url.split('://', 1)[1]
+
+        collector = RecordCollector()
+        if args.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        asyncio.run(run_sweep(companies, collector, Filters(), rate_limits=RATE_LIMITS if args.rate_limits else {},
+                              rewrite_url=rewrite_url, parse_workers=args.parse_workers))
+        wall = time.perf_counter() - start
+        traced_peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+        tracemalloc.stop()
+        served = server_stats(port)
+    finally:
+        proc.terminate()
+        proc.join()
+
+    postings = args.companies * args.jobs
+    report = {
+        'companies': args.companies,
+        'jobs_per_board': args.jobs,
+        'latency_s': args.latency,
+        'rate_limits': args.rate_limits,
+        'parse_workers': args.parse_workers,
+        'wall_s': round(wall, 3),
+        'requests': served['requests'],
+        'bytes': served['bytes'],
+        'postings': postings,
+        'matched': collector.written,
+        'jobs_per_s': round(postings / wall, 1),
+        'requests_per_s': round(served['requests'] / wall, 1),
+        # ru_maxrss is KiB on Linux
+        'peak_rss_mib': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'peak_traced_mib': round(traced_peak / 2 ** 20, 1) if traced_peak is not None else None,
+    }
+    width = max(map(len, report))
+    for key, value in report.items():
+        print(f'{key:<{width}}  {value}')
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+"""Check company career boards for new job postings.
+
+    from jobscraper import scrape
+    jobs = scrape([{'company': 'Calm', 'careers_url': 'https://job-boards.greenhouse.io/calm',
+                    'platform': 'greenhouse'}])
+
+The command-line entry point is jobscraper.cli.main (`python -m jobscraper`).
+"""
+from jobscraper.sweep import Filters, run_sweep, scrape
+
+__all__ = ['Filters', 'run_sweep', 'scrape']
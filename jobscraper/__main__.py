@@ -0,0 +1,5 @@
+import sys
+
+from jobscraper.cli import main
+
+sys.exit(main())
@@ -0,0 +1,266 @@
+import csv
+import importlib.util
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from jobscraper.pipeline import FIELDS
+from jobscraper.state import STATE_DIR
+
+# Root of the Parquet archive: one hive partition per UTC scrape date,
+# archive/scraped=YYYY-MM-DD/part-*.parquet
+ARCHIVE_DIR = STATE_DIR / 'archive'
+
+# Buffered rows are written out as a new part file once there are this many, or once
+# the oldest has waited FLUSH_SECONDS (and always on close)
+PART_ROWS = 5000
+FLUSH_SECONDS = 30
+# A partition is rewritten as one file once a flush leaves it with this many part files
+# (close() checks every partition), so long-running daemons don't pile up small files
+COMPACT_MIN_FILES = 16
+
+# Workday only says how long ago a job was posted
+_RELATIVE_DATE = re.compile(r'posted\s+(today|yesterday|(\d+)\+?\s+days?\s+ago)', re.IGNORECASE)
+
+
+def has_parquet():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def normalize_date(value, scraped_at):
+    """Best-effort UTC datetime for the date formats the boards send, else None.
+
+    Handles epoch milliseconds/seconds, ISO 8601 with or without offset (naive means UTC,
+    which is what the Lever scraper produces) and Workday's "Posted 3 Days Ago", which is
+    resolved against `scraped_at`.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.isdigit()):
+        seconds = float(value)
+        if seconds > 1e11:
+            seconds /= 1000
+        return datetime.fromtimestamp(seconds, timezone.utc)
+    text = str(value).strip()
+    relative = _RELATIVE_DATE.search(text)
+    if relative:
+        word, days = relative.group(1).lower(), relative.group(2)
+        days = 0 if word == 'today' else 1 if word == 'yesterday' else int(days)
+        return scraped_at - timedelta(days=days)
+    try:
+        parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _upgrade_header(path):
+    # Archives written before a column was added get it (empty) so rows can keep being appended
+    with path.open(newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is None or reader.fieldnames == FIELDS:
+            return
+        tmp = path.with_name(path.name + '.tmp')
+        with tmp.open('w', newline='', encoding='utf-8') as out:
+            writer = csv.DictWriter(out, FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(reader)
+    tmp.replace(path)
+
+
+class CsvArchive:
+    """The original append-only archive (output_old.csv), used when pyarrow isn't installed."""
+
+    def __init__(self, path):
+        self.path = path
+        new_archive = not path.exists()
+        if not new_archive:
+            _upgrade_header(path)
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, FIELDS)
+        if new_archive:
+            self._writer.writeheader()
+
+    def __str__(self):
+        return str(self.path)
+
+    def append(self, record):
+        self._writer.writerow(record)
+
+    def records(self):
+        # Every archived row, as dicts of FIELDS
+        self._file.flush()
+        with self.path.open(newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+
+    def flush(self, force=False):
+        self._file.flush()
+        return True
+
+    def close(self):
+        self._file.close()
+
+
+def _schema():
+    import pyarrow as pa
+
+    timestamp = pa.timestamp('s', tz='UTC')
+    return pa.schema([
+        ('company', pa.string()), ('title', pa.string()), ('location', pa.string()), ('link', pa.string()),
+        ('postedOn', timestamp), ('updatedOn', timestamp), ('change', pa.string()), ('scrapedAt', timestamp),
+    ])
+
+
+def _partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    # Declared as a string so date ranges compare as 'YYYY-MM-DD' text and prune partitions
+    return ds.partitioning(pa.schema([('scraped', pa.string())]), flavor='hive')
+
+
+def _dataset_schema():
+    import pyarrow as pa
+
+    return _schema().append(pa.field('scraped', pa.string()))
+
+
+class ParquetArchive:
+    """Columnar archive: Parquet files partitioned by scrape date, dates normalized to UTC.
+
+    Rows are buffered and written as part files; query() reads only the columns and
+    partitions it needs. Part files are atomically renamed into place, and readers skip
+    names starting with '.', so a crash never leaves a half-written file visible.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._rows = []
+        self._oldest = None
+
+    def __str__(self):
+        return str(self.root)
+
+    def append(self, record, scraped_at=None):
+        scraped_at = scraped_at or datetime.now(timezone.utc)
+        row = {field: record.get(field) or None for field in ('company', 'title', 'location', 'link', 'change')}
+        row['postedOn'] = normalize_date(record.get('postedOn'), scraped_at)
+        row['updatedOn'] = normalize_date(record.get('updatedOn'), scraped_at)
+        row['scrapedAt'] = scraped_at
+        self._rows.append(row)
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+
+    def flush(self, force=False):
+        """Write buffered rows out; returns False while they are still only in memory."""
+        if not self._rows:
+            return True
+        if not force and len(self._rows) < PART_ROWS and time.monotonic() - self._oldest < FLUSH_SECONDS:
+            return False
+        import pyarrow as pa
+
+        by_day = {}
+        for row in self._rows:
+            by_day.setdefault(row['scrapedAt'].strftime('%Y-%m-%d'), []).append(row)
+        for day, rows in by_day.items():
+            part = self._write_part(day, pa.Table.from_pylist(rows, schema=_schema()))
+            self._compact_partition(part.parent, COMPACT_MIN_FILES)
+        self._rows = []
+        self._oldest = None
+        return True
+
+    def _write_part(self, day, table, name=None):
+        import pyarrow.parquet as pq
+
+        partition = self.root / f'scraped={day}'
+        partition.mkdir(exist_ok=True)
+        name = name or f'part-{time.time_ns()}.parquet'
+        tmp = partition / f'.{name}.tmp'
+        pq.write_table(table, tmp, compression='zstd')
+        tmp.replace(partition / name)
+        return partition / name
+
+    def _compact_partition(self, partition, min_files):
+        # Rewrite `partition` as one file if it holds at least `min_files` part files
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        parts = sorted(partition.glob('part-*.parquet'))
+        if len(parts) < min_files:
+            return False
+        table = pa.concat_tables([pq.read_table(part) for part in parts])
+        merged = self._write_part(partition.name.split('=', 1)[1], table.select(_schema().names),
+                                  f'part-{time.time_ns()}-compacted.parquet')
+        for part in parts:
+            if part != merged:
+                part.unlink()
+        return True
+
+    def compact(self, min_files=COMPACT_MIN_FILES):
+        """Rewrite every partition holding at least `min_files` part files as a single
+        file; returns the number of partitions compacted."""
+        return sum(self._compact_partition(partition, min_files) for partition in sorted(self.root.glob('scraped=*')))
+
+    def import_csv(self, csv_path):
+        """One-time copy of an existing CSV archive. The CSV never recorded when its rows
+        were scraped, so they all go into one partition, dated from the CSV's last
+        modification; their posting dates are kept in postedOn."""
+        marker = self.root / f'.imported-{csv_path.name}'
+        if marker.exists() or not csv_path.exists():
+            return 0
+        scraped_at = datetime.fromtimestamp(csv_path.stat().st_mtime, timezone.utc)
+        imported = 0
+        with csv_path.open(newline='', encoding='utf-8') as f:
+            for record in csv.DictReader(f):
+                self.append(record, scraped_at=scraped_at)
+                imported += 1
+        self.flush(force=True)
+        self.compact(min_files=2)
+        marker.write_text(str(time.time()))
+        return imported
+
+    def query(self, columns=None, company=None, since=None, until=None, title=None):
+        """Rows scraped between `since` and `until` (dates, inclusive) as dicts.
+
+        `company` matches exactly, `title` as a case-insensitive substring. Only the
+        requested `columns` (default: all) and the partitions in the date range are read.
+        """
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(self.root, schema=_dataset_schema(), format='parquet', partitioning=_partitioning())
+        conditions = []
+        if since is not None:
+            conditions.append(ds.field('scraped') >= since.isoformat()[:10])
+        if until is not None:
+            conditions.append(ds.field('scraped') <= until.isoformat()[:10])
+        if company is not None:
+            conditions.append(ds.field('company') == company)
+        if title is not None:
+            conditions.append(pc.match_substring(ds.field('title'), title, ignore_case=True))
+        condition = None
+        for c in conditions:
+            condition = c if condition is None else condition & c
+        return dataset.to_table(columns=columns, filter=condition).to_pylist()
+
+    def records(self, columns=('company', 'title', 'location', 'link', 'change')):
+        # Every archived row, like CsvArchive.records() (only the columns asked for)
+        self.flush(force=True)
+        yield from self.query(columns=list(columns))
+
+    def close(self):
+        self.flush(force=True)
+        self.compact()
+
+
+def open_archive(csv_path):
+    """The Parquet archive when pyarrow is installed (importing `csv_path` on first use),
+    otherwise the CSV archive at `csv_path`. Returns (archive, rows imported)."""
+    if not has_parquet():
+        return CsvArchive(csv_path), 0
+    archive = ParquetArchive()
+    return archive, archive.import_csv(csv_path)
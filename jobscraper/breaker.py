@@ -0,0 +1,75 @@
+import time
+
+# Consecutive failures that open a host's circuit, and how long it stays open before a
+# single trial request is let through
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 60
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, host):
+        super().__init__(f"circuit open for {host}: too many recent failures")
+        self.host = host
+
+
+class _Circuit:
+    __slots__ = ('failures', 'opened_at', 'trial_in_flight')
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker.
+
+    After FAILURE_THRESHOLD consecutive failures (timeouts, connection errors, 5xx/429)
+    requests to the host fail fast with CircuitOpenError instead of each waiting out a
+    timeout. Once RESET_TIMEOUT has passed one trial request goes through (half-open): a
+    success closes the circuit, a failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuits = {}
+
+    def _circuit(self, host):
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = _Circuit()
+        return circuit
+
+    def before_request(self, host):
+        """Raise CircuitOpenError if the host's circuit is open; returns True when this
+        request is the half-open trial, which must end in record_success(),
+        record_failure() or release_trial()."""
+        circuit = self._circuit(host)
+        if circuit.opened_at is None:
+            return False
+        if circuit.trial_in_flight or time.monotonic() - circuit.opened_at < self.reset_timeout:
+            raise CircuitOpenError(host)
+        circuit.trial_in_flight = True
+        return True
+
+    def release_trial(self, host):
+        # The trial ended without telling us anything (cancelled, or failed on our side):
+        # let the next request be the trial instead
+        self._circuit(host).trial_in_flight = False
+
+    def record_success(self, host):
+        circuit = self._circuit(host)
+        circuit.failures = 0
+        circuit.opened_at = None
+        circuit.trial_in_flight = False
+
+    def record_failure(self, host):
+        circuit = self._circuit(host)
+        circuit.failures += 1
+        circuit.trial_in_flight = False
+        if circuit.opened_at is not None or circuit.failures >= self.failure_threshold:
+            circuit.opened_at = time.monotonic()
+
+    def open_hosts(self):
+        return sorted(host for host, c in self._circuits.items() if c.opened_at is not None)
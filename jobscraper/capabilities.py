@@ -0,0 +1,63 @@
+import contextvars
+import time
+
+from jobscraper.state import connect
+
+# Capability store of the sweep running in the current task (set by sweep_session); with
+# none, scrapers simply probe every time.
+current_capabilities = contextvars.ContextVar('current_capabilities', default=None)
+
+
+class CapabilityCache:
+    """Persisted record of which API variant last worked for a board.
+
+    Some platforms have several possible endpoints per tenant (Workable v3 vs v1, Lever's
+    global vs EU API). Scrapers try the remembered one first and fall back to the rest
+    only when it fails, so a tenant costs one request instead of a probe on every run.
+    """
+
+    def __init__(self, path='capabilities.sqlite3'):
+        self.db = connect(path)
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS capabilities ('
+            'platform TEXT, key TEXT, value TEXT, updated_at REAL, PRIMARY KEY (platform, key))'
+        )
+
+    def get(self, platform, key):
+        found = self.db.execute(
+            'SELECT value FROM capabilities WHERE platform = ? AND key = ?', (platform, key)
+        ).fetchone()
+        return found[0] if found else None
+
+    def set(self, platform, key, value):
+        with self.db:
+            self.db.execute('INSERT OR REPLACE INTO capabilities VALUES (?, ?, ?, ?)',
+                            (platform, key, value, time.time()))
+
+    def forget(self, platform, key):
+        with self.db:
+            self.db.execute('DELETE FROM capabilities WHERE platform = ? AND key = ?', (platform, key))
+
+    def close(self):
+        self.db.close()
+
+
+def probe_order(platform, key, candidates):
+    """`candidates` in the order to try them: the one that last worked first."""
+    cache = current_capabilities.get()
+    known = cache.get(platform, key) if cache is not None else None
+    if known not in candidates:
+        return list(candidates)
+    return [known] + [c for c in candidates if c != known]
+
+
+def remember(platform, key, value):
+    cache = current_capabilities.get()
+    if cache is not None and cache.get(platform, key) != value:
+        cache.set(platform, key, value)
+
+
+def forget(platform, key):
+    cache = current_capabilities.get()
+    if cache is not None:
+        cache.forget(platform, key)
@@ -0,0 +1,295 @@
+import argparse
+import asyncio
+import csv
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+from jobscraper.archive import has_parquet, open_archive
+from jobscraper.breaker import CircuitBreaker
+from jobscraper.capabilities import CapabilityCache
+from jobscraper.companies import CompaniesError, load_companies
+from jobscraper.costs import CostHistory
+from jobscraper.daemon import MAX_INTERVAL, MIN_INTERVAL, PollSchedule, run_daemon
+from jobscraper.fetch import MAX_CONNECTIONS
+from jobscraper.httpcache import ResponseCache
+from jobscraper.metrics import RunMetrics
+from jobscraper.negative_cache import NegativeCache
+from jobscraper.neardup import NearDuplicateIndex
+from jobscraper.pipeline import ResultWriter
+from jobscraper.seen import SeenLinks
+from jobscraper.shard import ShardSeen, finish_shard, merge_shards, parse_shard, select_shard, start_shard
+from jobscraper.snapshots import SnapshotStore
+from jobscraper.state import STATE_DIR
+from jobscraper.sweep import Filters, run_sweep
+
+OUTPUT_PATH = Path('output.csv')
+ARCHIVE_PATH = Path('output_old.csv')
+REPORT_PATH = STATE_DIR / 'run_report.json'
+PROMETHEUS_PATH = STATE_DIR / 'jobscraper.prom'
+DEAD_BOARDS_PATH = STATE_DIR / 'dead_boards.csv'
+# Archive columns printed by --query
+QUERY_COLUMNS = ['scraped', 'company', 'title', 'location', 'link', 'postedOn', 'updatedOn', 'change']
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='jobscraper', description='Check company career boards for new job postings.')
+    parser.add_argument('--companies', type=Path, help='read companies from this local CSV instead of Google Drive')
+    parser.add_argument('--offline', action='store_true', help='use the cached companies list without refreshing it')
+    parser.add_argument('--report', type=Path, default=REPORT_PATH, help='where to write the JSON run report')
+    parser.add_argument('--prometheus', type=Path, default=PROMETHEUS_PATH,
+                        help='where to write the Prometheus textfile-collector metrics')
+    parser.add_argument('--profile', type=int, nargs='?', const=10, metavar='N',
+                        help='print the N slowest boards (default 10) after the run')
+    parser.add_argument('--connections', type=int, default=MAX_CONNECTIONS, metavar='N',
+                        help=f'I/O stage: sockets open across all hosts at once (default {MAX_CONNECTIONS})')
+    parser.add_argument('--parse-workers', type=int, nargs='?', const=None, default=0, metavar='N',
+                        help='parse stage: decode large responses in N worker processes '
+                             '(no N: one per CPU; default: in the main process)')
+    parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                        help='only scrape the i-th of N slices of the companies list (see --merge)')
+    parser.add_argument('--merge', action='store_true',
+                        help='fold the output of finished shards into output.csv, the archive and the seen index')
+    parser.add_argument('--daemon', action='store_true',
+                        help='keep running and poll every board on its own schedule, adapted to how often it changes')
+    parser.add_argument('--min-interval', type=float, default=MIN_INTERVAL / 60, metavar='MINUTES',
+                        help=f'daemon: shortest time between two polls of a board (default {MIN_INTERVAL // 60})')
+    parser.add_argument('--max-interval', type=float, default=MAX_INTERVAL / 60, metavar='MINUTES',
+                        help=f'daemon: longest time between two polls of a board (default {MAX_INTERVAL // 60})')
+    parser.add_argument('--query', action='store_true',
+                        help='print archived postings as CSV, narrowed by --company/--since/--until/--title, and exit')
+    parser.add_argument('--company', help='query: only this company')
+    parser.add_argument('--since', type=date.fromisoformat, metavar='YYYY-MM-DD', help='query: scraped on or after')
+    parser.add_argument('--until', type=date.fromisoformat, metavar='YYYY-MM-DD', help='query: scraped on or before')
+    parser.add_argument('--title', help='query: title contains this text (case-insensitive)')
+    parser.add_argument('--compact', action='store_true',
+                        help='rewrite every archive partition with more than one file as a single file and exit')
+    parser.add_argument('--keep-duplicates', action='store_true',
+                        help='write near-duplicate postings (same role under another link) to output.csv too')
+    parser.add_argument('--dead-boards', action='store_true',
+                        help='list the boards that keep failing (for cleaning up the companies list) and exit')
+    return parser
+
+
+def print_profile(metrics, n):
+    print(f"\n⏱️ {n} slowest boards:")
+    print(f"{'seconds':>8} {'queued':>7} {'reqs':>5} {'pages':>5} {'KiB':>8} {'parse s':>8} {'seen':>6} {'kept':>5}  "
+          f"company (platform)")
+    for m in metrics.slowest(n):
+        print(f"{m.duration or 0:8.2f} {m.queued:7.2f} {m.requests:5d} {m.pages:5d} {m.bytes / 1024:8.1f} "
+              f"{m.parse_seconds:8.3f} {m.postings_seen:6d} {m.postings_kept:5d}  {m.company} ({m.platform})"
+              + (f"  errors: {len(m.errors)}" if m.errors else ''))
+
+
+def print_plan(metrics):
+    plan = metrics.plan
+    if not plan['boards']:
+        return
+    actual = metrics.finished - metrics.started
+    print(f"⏱️ Sweep took {actual:.1f}s; expected at least {plan['expected_makespan_s']:.1f}s, "
+          f"the longest board ({plan['longest_board']})"
+          + (f"; {plan['estimated_boards']} of {plan['boards']} boards estimated by platform"
+             if plan['estimated_boards'] else ""))
+
+
+def open_archive_verbose():
+    archive, imported = open_archive(ARCHIVE_PATH)
+    if imported:
+        print(f"📥 Imported {imported} rows from '{ARCHIVE_PATH}' into the Parquet archive at '{archive}'")
+    return archive
+
+
+def shard_caches(response_cache, snapshots):
+    # What a shard run saves in its directory for --merge to commit (see finish_shard)
+    return {'http_cache.json': response_cache, 'snapshots.json': snapshots}
+
+
+def open_near_duplicates(args, archive):
+    # Clones are collapsed against every posting reported so far, across runs; the first
+    # run indexes what the archive already holds.
+    if args.keep_duplicates:
+        return None
+    index = NearDuplicateIndex()
+    imported = index.migrate(archive, archive.records())
+    if imported:
+        print(f"📥 Indexed {imported} archived postings for near-duplicate detection")
+    return index
+
+
+def query_archive(args):
+    if not has_parquet():
+        print("[ERROR] --query needs the Parquet archive: pip install pyarrow")
+        return 1
+    archive = open_archive_verbose()
+    rows = archive.query(columns=QUERY_COLUMNS, company=args.company, since=args.since, until=args.until,
+                         title=args.title)
+    writer = csv.DictWriter(sys.stdout, QUERY_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return 0
+
+
+def print_dead_boards(rows):
+    if not rows:
+        print("No failing boards.")
+        return
+    print(f"{'fails':>5}  {'skipped until':16}  company (platform) -- last error")
+    for row in rows:
+        print(f"{row['failures']:5d}  {row['skip_until'] or '-':16}  {row['company']} ({row['platform']}) "
+              f"-- {row['last_error']}")
+
+
+def run_forever(args, seen, filters, response_cache, snapshots, negative_cache):
+    schedule = PollSchedule(min_interval=args.min_interval * 60, max_interval=args.max_interval * 60)
+
+    def load():
+        return load_companies(args.companies, offline=args.offline)
+
+    def after_batch(metrics):
+        # The batch's records are flushed, so its boards can be remembered as seen
+        response_cache.commit()
+        snapshots.commit()
+        metrics.write_json(args.report)
+        metrics.write_prometheus(args.prometheus)
+        negative_cache.write_report(DEAD_BOARDS_PATH)
+        next_due = time.strftime('%H:%M', time.localtime(schedule.next_due()))
+        print(f"🕒 Polled {len(metrics.companies)} boards, {writer.written} jobs written since start; "
+              f"next poll at {next_due}")
+
+    print(f"🔄 Daemon mode: polling every board between {args.min_interval:g} and {args.max_interval:g} minutes apart")
+    archive = open_archive_verbose()
+    with ResultWriter(seen, OUTPUT_PATH, archive, open_near_duplicates(args, archive)) as writer:
+        try:
+            asyncio.run(run_daemon(load, writer, schedule, filters, after_batch, negative_cache, snapshots,
+                                   cache=response_cache, parse_workers=args.parse_workers,
+                                   max_connections=args.connections, capabilities=CapabilityCache()))
+        except KeyboardInterrupt:
+            print("\n👋 Stopped. Boards from the interrupted batch are polled again on the next start.")
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.daemon and args.shard:
+        parser.error('--daemon and --shard cannot be combined')
+
+    if args.query:
+        return query_archive(args)
+    if args.compact:
+        if not has_parquet():
+            print("[ERROR] --compact needs the Parquet archive: pip install pyarrow")
+            return 1
+        print(f"🗜️ Compacted {open_archive_verbose().compact(min_files=2)} archive partitions")
+        return 0
+
+    negative_cache = NegativeCache()
+    if args.dead_boards:
+        print_dead_boards(negative_cache.write_report(DEAD_BOARDS_PATH))
+        return 0
+
+    # Links reported by earlier runs. Lookups hit an on-disk index, so startup cost doesn't
+    # grow with the archive; the first run imports the links already in output_old.csv.
+    seen = SeenLinks()
+    migrated = seen.migrate_csv(ARCHIVE_PATH)
+    if migrated:
+        print(f"📥 Imported {migrated} links from '{ARCHIVE_PATH}' into the seen-links index")
+
+    if args.merge:
+        fingerprint = Filters().fingerprint
+        caches = shard_caches(ResponseCache(salt=fingerprint), SnapshotStore(salt=fingerprint))
+        archive = open_archive_verbose()
+        with ResultWriter(seen, OUTPUT_PATH, archive, open_near_duplicates(args, archive)) as writer:
+            merged, unfinished = merge_shards(writer, caches)
+        print(f"🧩 Merged {len(merged)} shards ({', '.join(merged) or 'none'}): {writer.written} jobs saved to "
+              f"'{OUTPUT_PATH}' and appended to '{writer.archive}'.")
+        if writer.changes['duplicate']:
+            print(f"🪞 {writer.changes['duplicate']} near-duplicate postings left out of '{OUTPUT_PATH}'")
+        if unfinished:
+            print(f"[WARN] Not merged, re-run these shards first: {', '.join(unfinished)}")
+        return 0
+
+    # The company list lives on Google Drive (see jobscraper/companies.py); a cached copy
+    # is kept under .jobscraper/ so startup doesn't depend on Drive being reachable.
+    try:
+        companies = load_companies(args.companies, offline=args.offline)
+    except CompaniesError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    # A shard scrapes its slice of the companies into its own directory and leaves the
+    # shared seen index, archive and near-duplicate index alone until --merge.
+    output_path, archive, run_seen, near_duplicates = OUTPUT_PATH, None, seen, None
+    if args.shard:
+        index, count = args.shard
+        companies = select_shard(companies, index, count)
+        shard_path = start_shard(index, count)
+        output_path, run_seen = shard_path / 'output.csv', ShardSeen(seen)
+        print(f"🧩 Shard {index}/{count}: {len(companies)} companies")
+
+    filters = Filters()
+    # Boards unchanged since the last run are skipped. The salt ties cached entries to the
+    # current filters, so editing the keyword lists forces a full re-scan.
+    response_cache = ResponseCache(salt=filters.fingerprint)
+    # Last run's matching postings per board, to report updates and closures as well
+    snapshots = SnapshotStore(salt=filters.fingerprint)
+
+    if args.daemon:
+        return run_forever(args, seen, filters, response_cache, snapshots, negative_cache)
+    if not args.shard:
+        archive = open_archive_verbose()
+        near_duplicates = open_near_duplicates(args, archive)
+
+    # Records stream straight into the writer, which dedups them and appends to
+    # output.csv and the archive as they arrive.
+    metrics = RunMetrics()
+    breaker = CircuitBreaker()
+    # Past durations per board, to start the longest ones first
+    costs = CostHistory()
+    with ResultWriter(run_seen, output_path, archive, near_duplicates) as writer:
+        written = asyncio.run(run_sweep(companies, writer, filters, response_cache, metrics=metrics,
+                                        negative_cache=negative_cache, breaker=breaker,
+                                        parse_workers=args.parse_workers, max_connections=args.connections,
+                                        snapshots=snapshots, capabilities=CapabilityCache(), costs=costs))
+    changes = writer.changes
+    summary = (f"{changes['new']} new, {changes['updated']} updated, {changes['reopened']} reopened and "
+               f"{changes['closed']} closed jobs")
+    if args.shard:
+        finish_shard(shard_path, len(companies), written, shard_caches(response_cache, snapshots))
+        print(f"\n✅ Scraped {summary}. Output saved to '{output_path}'; run --merge once all shards are done.")
+    else:
+        print(f"\n✅ Scraped {summary}. Output saved to '{OUTPUT_PATH}' and appended to '{archive}'.")
+    if changes['duplicate']:
+        print(f"🪞 {changes['duplicate']} near-duplicate postings (same role under another link) left out of "
+              f"'{output_path}'; archived with change=duplicate")
+    stats = filters.locations.cache_stats()
+    print(f"📍 Location cache: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+
+    # Only now that the results are on disk is it safe to remember which boards we've seen
+    # (for a shard: once it is merged)
+    if not args.shard:
+        response_cache.commit()
+        snapshots.commit()
+    costs.commit()
+    cache_stats = response_cache.stats
+    print(f"🗄️ Response cache: {cache_stats['not_modified']} not modified, {cache_stats['unchanged']} unchanged, "
+          f"{cache_stats['changed']} changed")
+
+    metrics.write_json(args.report)
+    metrics.write_prometheus(args.prometheus)
+    print(f"📊 Run report written to '{args.report}', metrics to '{args.prometheus}'")
+    print_plan(metrics)
+    if args.profile:
+        print_profile(metrics, args.profile)
+
+    dead = negative_cache.write_report(DEAD_BOARDS_PATH)
+    if dead:
+        print(f"🪦 {len(dead)} boards are failing repeatedly; see '{DEAD_BOARDS_PATH}' or run with --dead-boards")
+    if breaker.open_hosts():
+        print(f"🔌 Circuit open at the end of the run for: {', '.join(breaker.open_hosts())}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+import time
+import urllib.error
+import urllib.request
+
+from jobscraper.state import STATE_DIR
+
+# Link to the file -- please add more companies to this as you find them
+# https://drive.google.com/file/d/1oPIqvsKTcXw7zS2gtlrSsFl3bmjbxg17/view?usp=sharing
+FILE_ID = '1oPIqvsKTcXw7zS2gtlrSsFl3bmjbxg17'
+COMPANIES_URL = f'https://drive.google.com/uc?export=download&id={FILE_ID}'
+
+REQUIRED_COLUMNS = ('company', 'careers_url', 'platform')
+
+# The cached copy is used as-is for this long before we ask Drive for a newer one
+CACHE_TTL = 6 * 60 * 60
+DOWNLOAD_TIMEOUT = 30
+
+CACHE_FILE = 'companies.csv'
+CACHE_META_FILE = 'companies.meta.json'
+
+
+class CompaniesError(Exception):
+    pass
+
+
+def board_key(row):
+    # Identifies a board across runs, whatever the company is called in the list
+    return f"{row['platform'].lower()}|{row['careers_url']}"
+
+
+def parse_companies(text, source):
+    """Parse and validate the companies CSV; rows missing a required field are skipped."""
+    reader = csv.DictReader(io.StringIO(text))
+    missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        raise CompaniesError(f"{source} is missing required column(s): {', '.join(missing)}")
+    rows = []
+    for line_no, row in enumerate(reader, start=2):
+        if not all((row.get(c) or '').strip() for c in REQUIRED_COLUMNS):
+            print(f"[WARN] Skipping incomplete row {line_no} in {source}: {row}")
+            continue
+        rows.append({k: (v or '').strip() for k, v in row.items() if k})
+    return rows
+
+
+def _read_meta(meta_path):
+    try:
+        return json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _refresh_cache(url, cache_path, meta_path, meta):
+    request = urllib.request.Request(url)
+    if meta.get('etag'):
+        request.add_header('If-None-Match', meta['etag'])
+    if meta.get('last_modified'):
+        request.add_header('If-Modified-Since', meta['last_modified'])
+    try:
+        with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as resp:
+            text = resp.read().decode('utf-8-sig')
+            etag, last_modified = resp.headers.get('ETag'), resp.headers.get('Last-Modified')
+    except urllib.error.HTTPError as e:
+        if e.code != 304:
+            raise
+        # Unchanged: keep the cached copy and just restart the TTL
+        meta['fetched_at'] = time.time()
+        meta_path.write_text(json.dumps(meta))
+        return
+    # Validate before replacing a good cached copy with a broken download
+    parse_companies(text, url)
+    cache_path.write_text(text, encoding='utf-8')
+    meta_path.write_text(json.dumps({'fetched_at': time.time(), 'etag': etag, 'last_modified': last_modified}))
+
+
+def load_companies(path=None, offline=False, ttl=CACHE_TTL, url=COMPANIES_URL, state_dir=STATE_DIR):
+    """Return the company rows to scrape.
+
+    `path` reads a local CSV and skips Drive entirely. Otherwise the Drive list is served
+    from a cached copy, refreshed with a conditional request once it is older than `ttl`;
+    if Drive is unreachable the cached copy is used anyway. `offline` never touches the
+    network and fails if there is no cached copy yet.
+    """
+    if path is not None:
+        try:
+            text = path.read_text(encoding='utf-8-sig')
+        except OSError as e:
+            raise CompaniesError(f"Could not read companies file {path}: {e}")
+        return parse_companies(text, str(path))
+
+    cache_path = state_dir / CACHE_FILE
+    meta_path = state_dir / CACHE_META_FILE
+    meta = _read_meta(meta_path)
+    has_cache = cache_path.exists()
+
+    if offline:
+        if not has_cache:
+            raise CompaniesError("Offline mode needs a cached companies list; run once online first")
+    elif not has_cache or time.time() - meta.get('fetched_at', 0) > ttl:
+        state_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            _refresh_cache(url, cache_path, meta_path, meta)
+        except (OSError, CompaniesError) as e:
+            if not has_cache:
+                raise CompaniesError(f"Could not download the companies list: {e}")
+            print(f"[WARN] Could not refresh the companies list ({e}); using the cached copy")
+
+    return parse_companies(cache_path.read_text(encoding='utf-8'), str(cache_path))
@@ -0,0 +1,10 @@
+# --- CONFIG ---
+KEYWORDS = ['backend', 'back-end', 'back end', 'software', 'full-stack', 'fullstack', 'full stack', 'java', 'front-end',
+            'front end', 'frontend', 'developer', 'infrastructure', 'ui', 'devops', 'programmer', 'spring',
+            'api', 'cloud', 'co-op', 'user interface', 'application']
+
+NO_KEYWORDS = ['manager', 'staff', 'senior', 'director', "embedded", 'c++', 'machine', 'principal', 'lead',
+               'recruit', 'vice president', 'talent']
+
+# Keywords that must appear as a whole word, so 'ui' doesn't match "build" or "guide"
+WHOLE_WORD_KEYWORDS = ['ui', 'api']
@@ -0,0 +1,99 @@
+import statistics
+import time
+
+from jobscraper.companies import board_key
+from jobscraper.state import connect
+
+# Weight of the latest run in a board's remembered duration and request count
+COST_SMOOTHING = 0.5
+# Seconds assumed for a board of a platform we have no history for at all. Workday is
+# paced at 0.5 requests/s per tenant and pages 20 postings at a time; the rest mostly
+# answer in one or two requests.
+PLATFORM_COSTS = {'workday': 30.0, 'smartrecruiters': 5.0, 'workable': 5.0}
+DEFAULT_COST = 2.0
+
+
+class CostHistory:
+    """Per-board scrape duration and request count, smoothed over past runs.
+
+    The duration is the board's own time (CompanyMetrics.duration, from its first
+    admitted request), not its wait behind other boards, so it doesn't depend on where
+    the board happened to be queued. order() puts the boards that took longest first,
+    so a long, sequentially paged board (a big Workday tenant) starts right away instead
+    of queueing behind short ones and finishing alone at the end of the sweep. Boards
+    without history are estimated from the median of their platform. A board whose
+    pages were partly unchanged makes every request but skips parsing some of them, so
+    its duration is instead taken as its request count at the board's usual seconds per
+    request. Observations are held until commit(), like the other caches.
+    """
+
+    def __init__(self, path='costs.sqlite3'):
+        self.db = connect(path)
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS boards ('
+            'key TEXT PRIMARY KEY, platform TEXT, duration REAL, requests REAL, runs INTEGER, updated REAL)'
+        )
+        self._pending = {}
+
+    def _known(self):
+        rows = self.db.execute('SELECT key, platform, duration, requests, runs FROM boards')
+        return {key: rest for key, *rest in rows}
+
+    def estimates(self, companies):
+        """{board key: (expected seconds, from history?)} for every row of `companies`."""
+        known = self._known()
+        by_platform = {}
+        for platform, duration, _, _ in known.values():
+            by_platform.setdefault(platform, []).append(duration)
+        medians = {platform: statistics.median(durations) for platform, durations in by_platform.items()}
+        estimates = {}
+        for row in companies:
+            key, platform = board_key(row), row['platform'].lower()
+            if key in known:
+                estimates[key] = (known[key][1], True)
+            else:
+                estimates[key] = (medians.get(platform, PLATFORM_COSTS.get(platform, DEFAULT_COST)), False)
+        return estimates
+
+    def order(self, companies):
+        """Return (rows longest-first, plan). Every board runs concurrently, so the sweep
+        can't end before its longest board: the plan's expected makespan is that board's
+        expected duration, a lower bound to compare the actual wall time with."""
+        estimates = self.estimates(companies)
+        ordered = sorted(companies, key=lambda row: estimates[board_key(row)][0], reverse=True)
+        longest = estimates[board_key(ordered[0])][0] if ordered else 0.0
+        plan = {
+            'boards': len(companies),
+            'estimated_boards': sum(not from_history for _, from_history in estimates.values()),
+            'longest_board': ordered[0]['company'] if ordered else None,
+            'expected_makespan_s': round(longest, 3),
+        }
+        return ordered, plan
+
+    def record(self, metrics):
+        """Fold the boards of a finished RunMetrics into their history."""
+        known = self._known()
+        for m in metrics.companies:
+            # A board that failed part-way, whose host was failing fast, or that never got
+            # a request out says nothing about how long it takes
+            if m.board is None or m.duration is None or m.short_circuited or m.errors or not m.requests:
+                continue
+            duration, requests, runs = m.duration, m.requests, 1
+            if m.not_modified and m.board not in known:
+                continue
+            if m.board in known:
+                _, old_duration, old_requests, runs = known[m.board]
+                if m.not_modified:
+                    duration = requests * old_duration / old_requests
+                duration = COST_SMOOTHING * duration + (1 - COST_SMOOTHING) * old_duration
+                requests = COST_SMOOTHING * requests + (1 - COST_SMOOTHING) * old_requests
+                runs += 1
+            self._pending[m.board] = (m.board, m.platform, duration, requests, runs, time.time())
+
+    def commit(self):
+        with self.db:
+            self.db.executemany('INSERT OR REPLACE INTO boards VALUES (?, ?, ?, ?, ?, ?)', self._pending.values())
+        self._pending.clear()
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,163 @@
+import asyncio
+import heapq
+import random
+import time
+
+from jobscraper.companies import CompaniesError, board_key
+from jobscraper.metrics import RunMetrics, log_error
+from jobscraper.pipeline import run_pipeline
+from jobscraper.state import connect
+from jobscraper.sweep import scrape_company, sweep_session
+
+# Bounds on how often one board is polled
+MIN_INTERVAL = 15 * 60
+MAX_INTERVAL = 24 * 60 * 60
+# Starting interval for a board we have no history for
+DEFAULT_INTERVAL = 2 * 60 * 60
+# A board is polled about as often as it is expected to show this many changes
+CHANGES_PER_POLL = 1
+# Weight of the latest poll in a board's change rate. A poll without changes scales the
+# rate by (1 - RATE_SMOOTHING), i.e. stretches the interval by ~1.4x.
+RATE_SMOOTHING = 0.3
+# Random spread on every interval, so boards polled together drift apart
+JITTER = 0.1
+# How often the daemon re-reads the companies list
+COMPANIES_REFRESH = 60 * 60
+# A batch that failed as a whole (e.g. a locked database) is polled again after this long
+BATCH_RETRY = 5 * 60
+
+
+class PollSchedule:
+    """Priority queue of boards ordered by when they are next due.
+
+    Every board keeps an exponentially weighted rate of changes (new, updated and closed
+    postings) per second. After each poll the next one is due once CHANGES_PER_POLL
+    changes are expected, clamped to [min_interval, max_interval]: boards that post
+    several times a day are polled within minutes, quiet ones back off to a daily check.
+    Rates and due times persist across restarts.
+    """
+
+    def __init__(self, path='schedule.sqlite3', min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+        self.db = connect(path)
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS boards (key TEXT PRIMARY KEY, rate REAL, last_polled REAL, next_due REAL)'
+        )
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._rows = {}
+        self._heap = []
+        self._pending = {}
+
+    def _state(self, key):
+        found = self._pending.get(key)
+        if found is None:
+            found = self.db.execute('SELECT * FROM boards WHERE key = ?', (key,)).fetchone()
+        if found is None:
+            return CHANGES_PER_POLL / DEFAULT_INTERVAL, None, None
+        return found[1:]
+
+    def sync(self, companies, now):
+        """(Re)build the queue from the companies list; boards without history are due now."""
+        self._rows = {board_key(row): row for row in companies}
+        self._heap = [(self._state(key)[2] or now, key) for key in self._rows]
+        heapq.heapify(self._heap)
+
+    def pop_due(self, now):
+        rows = []
+        while self._heap and self._heap[0][0] <= now:
+            _, key = heapq.heappop(self._heap)
+            if key in self._rows:
+                rows.append(self._rows[key])
+        return rows
+
+    def defer(self, row, due):
+        # Requeue a board without touching its history, e.g. after a failed poll
+        heapq.heappush(self._heap, (due, board_key(row)))
+
+    def next_due(self):
+        return self._heap[0][0] if self._heap else None
+
+    def interval(self, rate):
+        if rate <= 0:
+            return self.max_interval
+        return min(max(CHANGES_PER_POLL / rate, self.min_interval), self.max_interval)
+
+    def record(self, row, changes, now):
+        """Fold a finished poll into the board's rate and queue its next poll."""
+        key = board_key(row)
+        rate, last_polled, _ = self._state(key)
+        # The first poll only sets the baseline (every posting looks new to an empty snapshot)
+        if last_polled is not None and now > last_polled:
+            rate = RATE_SMOOTHING * changes / (now - last_polled) + (1 - RATE_SMOOTHING) * rate
+        next_due = now + self.interval(rate) * random.uniform(1 - JITTER, 1 + JITTER)
+        self._pending[key] = (key, rate, now, next_due)
+        heapq.heappush(self._heap, (next_due, key))
+
+    def commit(self):
+        with self.db:
+            self.db.executemany('INSERT OR REPLACE INTO boards VALUES (?, ?, ?, ?)', self._pending.values())
+        self._pending.clear()
+
+    def close(self):
+        self.db.close()
+
+
+async def run_daemon(load_companies, writer, schedule, filters, after_batch, negative_cache=None, snapshots=None,
+                     **session_options):
+    """Poll boards as they fall due, until cancelled.
+
+    One sweep session (connections, parse pool) stays open throughout. Boards that are
+    due together are polled as a batch through `writer`; afterwards `after_batch(metrics)`
+    runs with the batch's RunMetrics, which is the place to commit caches and write
+    reports since the batch's output is flushed by then. `load_companies()` is re-read
+    every COMPANIES_REFRESH seconds, in a thread since it may download the list.
+
+    A failing batch is logged and its boards are polled again after BATCH_RETRY; a
+    failure to save state afterwards is logged and retried with the next batch.
+    """
+    async with sweep_session(**session_options):
+        next_refresh = 0
+        while True:
+            now = time.time()
+            if now >= next_refresh:
+                try:
+                    schedule.sync(await asyncio.to_thread(load_companies), now)
+                except CompaniesError as e:
+                    print(f"[WARN] Keeping the current companies list: {e}")
+                next_refresh = now + COMPANIES_REFRESH
+
+            rows = schedule.pop_due(now)
+            if not rows:
+                due = schedule.next_due()
+                wait = min(due - now if due is not None else COMPANIES_REFRESH, next_refresh - now)
+                await asyncio.sleep(max(wait, 1))
+                continue
+
+            metrics = RunMetrics()
+            changes = {}
+
+            async def poll(row):
+                key = board_key(row)
+                changes[key] = 0
+                async for record in scrape_company(row, filters, metrics, negative_cache, snapshots):
+                    changes[key] += 1
+                    yield record
+
+            try:
+                await run_pipeline((poll(row) for row in rows), writer)
+                writer.flush(force=True)
+            except Exception as e:
+                log_error(f"Batch of {len(rows)} boards failed, polling them again in {BATCH_RETRY // 60} minutes: {e}")
+                for row in rows:
+                    schedule.defer(row, now + BATCH_RETRY)
+                continue
+            metrics.finish()
+            now = time.time()
+            for row in rows:
+                schedule.record(row, changes.get(board_key(row), 0), now)
+            try:
+                schedule.commit()
+                after_batch(metrics)
+            except Exception as e:
+                # Uncommitted state stays pending and goes out with the next batch
+                log_error(f"Could not save state after a batch, retrying after the next one: {e}")
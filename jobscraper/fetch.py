@@ -0,0 +1,352 @@
+import asyncio
+import contextvars
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from jobscraper.breaker import CircuitOpenError
+from jobscraper.metrics import current_metrics, record_parse, timed_parse
+from jobscraper.ratelimit import current_platform
+
+# Fetcher of the sweep running in the current task; scrapers resolve it through this so
+# several sweeps can share a process.
+current_fetcher = contextvars.ContextVar('current_fetcher')
+
+# --- CONFIG ---
+# Total sockets open across every host at once.
+MAX_CONNECTIONS = 100
+
+# Simultaneous requests allowed per ATS host. Most companies live on a handful of
+# shared API hosts, so those get wider pools; everything else uses DEFAULT_PER_HOST.
+HOST_CONCURRENCY = {
+    'boards-api.greenhouse.io': 16,
+    'api.lever.co': 16,
+    'api.eu.lever.co': 8,
+    'api.ashbyhq.com': 16,
+    'apply.workable.com': 8,
+    'api.smartrecruiters.com': 8,
+}
+DEFAULT_PER_HOST = 4
+
+# How long an idle keep-alive connection stays in the pool.
+KEEPALIVE_TIMEOUT = 30
+
+# Seconds to establish a TCP/TLS connection, and the longest gap allowed between two
+# reads of a response -- without these a single hung host stalls its task forever.
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 30
+
+# Read size when draining what's left of a streamed body
+CHUNK_SIZE = 64 * 1024
+
+# Statuses that say the host itself is struggling, as opposed to a bad board URL
+HOST_FAILURE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class Response:
+    # Fully-read response, so callers can use it after the connection is released.
+    # not_modified is set when the response cache says the body hasn't changed since the
+    # last run (a 304, or an identical body) -- scrapers skip parsing those.
+    __slots__ = ('url', 'status_code', 'headers', 'content', 'not_modified')
+
+    def __init__(self, url, status_code, headers, content, not_modified=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.not_modified = not_modified
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+
+def _mark_active(start):
+    # A board's duration starts with its first request, not with its task (see CompanyMetrics)
+    metrics = current_metrics.get()
+    if metrics is not None and metrics.active_since is None:
+        metrics.active_since = start
+
+
+def _cache_updated(cache_key):
+    # scrape_company drops these again if the board doesn't finish cleanly
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.cache_keys.append(cache_key)
+
+
+def _count_not_modified():
+    # Lets scrape_company tell a board it skipped (partly) from one that is really empty
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.not_modified += 1
+
+
+class _HashingBody:
+    # Hands the body to the parser chunk by chunk, hashing it for the response cache and
+    # timing how long the parser sat waiting on the network.
+    __slots__ = ('_content', 'digest', 'nbytes', 'wait_seconds')
+
+    def __init__(self, content):
+        self._content = content
+        self.digest = hashlib.sha256()
+        self.nbytes = 0
+        self.wait_seconds = 0.0
+
+    async def read(self, n=-1):
+        start = time.perf_counter()
+        chunk = await self._content.read(n)
+        self.wait_seconds += time.perf_counter() - start
+        self.digest.update(chunk)
+        self.nbytes += len(chunk)
+        return chunk
+
+
+def _items_at(data, prefix):
+    # What ijson.items(prefix) yields, for an already-decoded document
+    nodes = [data]
+    for part in prefix.split('.') if prefix else ():
+        if part == 'item':
+            nodes = [item for node in nodes if isinstance(node, list) for item in node]
+        else:
+            nodes = [node[part] for node in nodes if isinstance(node, dict) and part in node]
+    return nodes
+
+
+class StreamedResponse:
+    # Response whose body is still on the wire; see Fetcher.stream. `complete` is set once
+    # the whole body has been read, which is when its digest is usable.
+    __slots__ = ('url', 'status_code', 'headers', 'body', 'not_modified', 'complete')
+
+    def __init__(self, url, status_code, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.body = _HashingBody(content)
+        self.not_modified = False
+        self.complete = False
+
+    async def read(self):
+        content = await self.body.read()
+        self.complete = True
+        return content
+
+    async def items(self, prefix):
+        """Yield the JSON values at `prefix` (ijson syntax, e.g. 'jobs.item') one at a time.
+
+        With ijson installed only the value being yielded is held in memory, never the
+        whole document; without it the body is read and decoded in one go.
+        """
+        try:
+            import ijson
+        except ImportError:
+            content = await self.read()
+            with timed_parse():
+                items = _items_at(json.loads(content), prefix)
+            for item in items:
+                yield item
+            return
+
+        # Parse time is what the parser spends between items, minus its network waits
+        parse_seconds = 0.0
+        parser = ijson.items_async(self.body, prefix, use_float=True).__aiter__()
+        while True:
+            start, waited = time.perf_counter(), self.body.wait_seconds
+            try:
+                item = await parser.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                parse_seconds += time.perf_counter() - start - (self.body.wait_seconds - waited)
+            yield item
+        record_parse(parse_seconds)
+        # Trailing bytes after the last item still count towards the digest
+        while await self.body.read(CHUNK_SIZE):
+            pass
+        self.complete = True
+
+
+class Fetcher:
+    """Shared aiohttp session with keep-alive pooling, per-host concurrency caps and
+    timeouts, and optional per-platform rate limiting, per-host circuit breaking and
+    conditional-request caching."""
+
+    def __init__(self, max_connections=MAX_CONNECTIONS, host_concurrency=None, default_per_host=DEFAULT_PER_HOST,
+                 limiter=None, cache=None, rewrite_url=None, breaker=None, connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT):
+        self.max_connections = max_connections
+        self.host_concurrency = dict(HOST_CONCURRENCY)
+        if host_concurrency:
+            self.host_concurrency.update(host_concurrency)
+        self.default_per_host = default_per_host
+        self.limiter = limiter
+        self.cache = cache
+        # Maps a real API URL to the one actually requested (e.g. a local stand-in server
+        # in benchmarks); limits and cache keys still use the original URL.
+        self.rewrite_url = rewrite_url
+        self.breaker = breaker
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._semaphores = {}
+        self._session = None
+        self._transport_errors = ()
+
+    async def __aenter__(self):
+        import aiohttp
+
+        # limit_per_host is left at 0: per-host caps are enforced by our own semaphores
+        # so they can differ from host to host.
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=0,
+            ttl_dns_cache=300,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        self._transport_errors = (aiohttp.ClientError, asyncio.TimeoutError, OSError)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+        self._session = None
+
+    def _semaphore(self, host):
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.host_concurrency.get(host, self.default_per_host))
+            self._semaphores[host] = sem
+        return sem
+
+    async def _prepare(self, method, url, kwargs, conditional):
+        # Breaker, rate limit and conditional headers, shared by request() and stream()
+        host = urlsplit(url).hostname or ''
+        trial = False
+        if self.breaker is not None:
+            try:
+                trial = self.breaker.before_request(host)
+            except CircuitOpenError:
+                metrics = current_metrics.get()
+                if metrics is not None:
+                    metrics.short_circuited += 1
+                raise
+        platform = current_platform.get()
+        if self.limiter is not None and platform:
+            # Wait for a token before taking a connection slot, so throttled hosts
+            # don't starve the pool for everyone else.
+            try:
+                await self.limiter.acquire(platform, host)
+            except BaseException:
+                if trial:
+                    self.breaker.release_trial(host)
+                raise
+
+        cache_key = entry = None
+        if self.cache is not None:
+            cache_key = self.cache.key(method, url, kwargs.get('params'), kwargs.get('json'))
+            entry = self.cache.lookup(cache_key)
+            if entry is not None and conditional:
+                kwargs['headers'] = {**(kwargs.get('headers') or {}), **self.cache.conditional_headers(entry)}
+
+        target = self.rewrite_url(url) if self.rewrite_url is not None else url
+        return host, cache_key, entry, target, trial
+
+    def _record_status(self, host, status):
+        if self.breaker is not None:
+            if status in HOST_FAILURE_STATUSES:
+                self.breaker.record_failure(host)
+            else:
+                self.breaker.record_success(host)
+
+    async def request(self, method, url, conditional=True, **kwargs):
+        """Send one request and read the whole body. `conditional=False` sends no
+        validators, so the body always comes back (a 200 identical to the cached one is
+        still flagged not_modified)."""
+        host, cache_key, entry, target, trial = await self._prepare(method, url, kwargs, conditional)
+        recorded = False
+        try:
+            async with self._semaphore(host):
+                start = time.perf_counter()
+                _mark_active(start)
+                try:
+                    async with self._session.request(method, target, **kwargs) as resp:
+                        content = await resp.read()
+                        response = Response(str(resp.url), resp.status, resp.headers, content)
+                except self._transport_errors:
+                    if self.breaker is not None:
+                        self.breaker.record_failure(host)
+                        recorded = True
+                    raise
+                metrics = current_metrics.get()
+                if metrics is not None:
+                    metrics.observe_request(time.perf_counter() - start, len(content), resp.status)
+            self._record_status(host, response.status_code)
+            recorded = True
+        finally:
+            if trial and not recorded:
+                self.breaker.release_trial(host)
+
+        if cache_key is not None:
+            if response.status_code == 304:
+                self.cache.revalidated()
+                response.not_modified = True
+            elif response.status_code == 200:
+                response.not_modified = self.cache.update(cache_key, entry, response.headers, content)
+                _cache_updated(cache_key)
+        if response.not_modified:
+            _count_not_modified()
+        return response
+
+    @asynccontextmanager
+    async def stream(self, method, url, conditional=True, **kwargs):
+        """Like request(), but the body is parsed as it arrives instead of being read whole.
+
+            async with fetcher.stream('GET', url) as r:
+                async for job in r.items('jobs.item'):
+                    ...
+
+        The connection and its host slot are held until the block exits. Only a 304 sets
+        `not_modified` up front; a 200 whose body hashes the same as last time is still
+        parsed (the digest is only known at the end) but keeps the cache entry current.
+        """
+        host, cache_key, entry, target, trial = await self._prepare(method, url, kwargs, conditional)
+        recorded = False
+        try:
+            async with self._semaphore(host):
+                start = time.perf_counter()
+                _mark_active(start)
+                response = None
+                try:
+                    async with self._session.request(method, target, **kwargs) as resp:
+                        response = StreamedResponse(str(resp.url), resp.status, resp.headers, resp.content)
+                        self._record_status(host, resp.status)
+                        recorded = True
+                        if cache_key is not None and resp.status == 304:
+                            self.cache.revalidated()
+                            response.not_modified = True
+                            _count_not_modified()
+                        yield response
+                except self._transport_errors:
+                    if self.breaker is not None:
+                        self.breaker.record_failure(host)
+                        recorded = True
+                    raise
+                finally:
+                    metrics = current_metrics.get()
+                    if metrics is not None and response is not None:
+                        metrics.observe_request(time.perf_counter() - start, response.body.nbytes,
+                                                response.status_code)
+        finally:
+            if trial and not recorded:
+                self.breaker.release_trial(host)
+        if cache_key is not None and response.status_code == 200 and response.complete:
+            self.cache.update_digest(cache_key, entry, response.headers, response.body.digest.hexdigest())
+            _cache_updated(cache_key)
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
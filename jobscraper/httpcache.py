@@ -0,0 +1,96 @@
+import hashlib
+import json
+import time
+from collections import Counter, namedtuple
+
+from jobscraper.state import connect
+
+CacheEntry = namedtuple('CacheEntry', ['etag', 'last_modified', 'digest'])
+
+
+class ResponseCache:
+    """Persistent validator store for conditional requests.
+
+    For every request we remember the ETag / Last-Modified the server sent and a hash of
+    the body. The next run sends If-None-Match / If-Modified-Since; a 304, or a 200 whose
+    body hashes the same (hosts without validators), marks the response `not_modified`
+    so scrapers can skip parsing it.
+
+    Updates are held in memory until commit(), which the caller runs once the sweep's
+    output is safely written -- otherwise a crashed run would mark boards as seen and the
+    next run would skip postings that were never saved. `salt` should change whenever the
+    filters change, since an unchanged board may still hold postings a new filter wants.
+    """
+
+    def __init__(self, path='http_cache.sqlite3', salt=''):
+        self.db = connect(path)
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, digest TEXT, salt TEXT, stored_at REAL)'
+        )
+        self.salt = salt
+        self.stats = Counter()
+        self._pending = {}
+
+    @staticmethod
+    def key(method, url, params=None, body=None):
+        parts = [method.upper(), url]
+        if params:
+            parts.append(json.dumps(params, sort_keys=True, default=str))
+        if body is not None:
+            parts.append(json.dumps(body, sort_keys=True, default=str))
+        return hashlib.sha1('\n'.join(parts).encode()).hexdigest()
+
+    def lookup(self, key):
+        row = self.db.execute(
+            'SELECT etag, last_modified, digest FROM responses WHERE key = ? AND salt = ?', (key, self.salt)
+        ).fetchone()
+        return CacheEntry(*row) if row else None
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def revalidated(self):
+        # 304: the stored entry stays as it is
+        self.stats['not_modified'] += 1
+
+    def update(self, key, entry, headers, content):
+        """Record a 200 response; returns True when its body is identical to the cached one."""
+        return self.update_digest(key, entry, headers, hashlib.sha256(content).hexdigest())
+
+    def update_digest(self, key, entry, headers, digest):
+        # Same as update(), for bodies that were hashed while being streamed
+        unchanged = entry is not None and entry.digest == digest
+        self.stats['unchanged' if unchanged else 'changed'] += 1
+        self._pending[key] = (key, headers.get('ETag'), headers.get('Last-Modified'), digest, self.salt, time.time())
+        return unchanged
+
+    def discard(self, keys):
+        """Drop pending updates, e.g. those of a board that failed part-way: its pages
+        must not look unchanged next run while some of its postings were never saved."""
+        for key in keys:
+            self._pending.pop(key, None)
+
+    def dump_pending(self, path):
+        # A shard run saves its updates next to its output instead; --merge loads them back
+        path.write_text(json.dumps(list(self._pending.values())))
+
+    def load_pending(self, path):
+        # Entries stored under other filters would never be looked up again
+        for row in json.loads(path.read_text()):
+            if row[4] == self.salt:
+                self._pending[row[0]] = tuple(row)
+
+    def commit(self):
+        with self.db:
+            self.db.executemany('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)', self._pending.values())
+        self._pending.clear()
+
+    def close(self):
+        self.db.close()
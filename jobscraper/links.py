@@ -0,0 +1,98 @@
+import hashlib
+import importlib.util
+from collections import OrderedDict
+from html.parser import HTMLParser
+
+# Pages whose extracted links are kept in memory, keyed by a hash of the page
+CACHE_SIZE = 256
+
+
+class _AnchorParser(HTMLParser):
+    # Tokenizes the page but only keeps <a href> tags and their text; no tree is built.
+    # With inside_li, only anchors nested in an <li> count (like the CSS 'li a[href]').
+    def __init__(self, inside_li):
+        super().__init__()
+        self.inside_li = inside_li
+        self.li_depth = 0
+        self.links = []
+        self._href = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'li':
+            self.li_depth += 1
+        elif tag == 'a':
+            self._close_anchor()
+            href = dict(attrs).get('href')
+            if href is not None and (self.li_depth or not self.inside_li):
+                self._href = href
+
+    def handle_endtag(self, tag):
+        if tag == 'li':
+            self.li_depth = max(self.li_depth - 1, 0)
+        elif tag == 'a':
+            self._close_anchor()
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def _close_anchor(self):
+        if self._href is not None:
+            self.links.append((self._href, ''.join(self._text).strip()))
+        self._href = None
+        self._text = []
+
+    def close(self):
+        super().close()
+        self._close_anchor()
+
+
+def _extract_stdlib(html, inside_li):
+    parser = _AnchorParser(inside_li)
+    parser.feed(html)
+    parser.close()
+    return parser.links
+
+
+def _extract_selectolax(html, inside_li):
+    # The Lexbor backend: selectolax.parser (Modest) is deprecated and fails to import in 1.0
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    return [(a.attributes['href'] or '', a.text().strip())
+            for a in tree.css('li a[href]' if inside_li else 'a[href]')]
+
+
+# Checked without importing, so loading the package doesn't pull in the parser
+_extract = _extract_selectolax if importlib.util.find_spec('selectolax') else _extract_stdlib
+
+
+class LinkExtractor:
+    """Pulls (href, text) pairs out of a careers page.
+
+    Uses selectolax's Lexbor parser (a C DOM, queried with a CSS selector) when it is
+    installed, and otherwise a stdlib tokenizer that only looks at <a> tags and builds
+    no DOM. Results are memoized per page hash, so a page seen again (several
+    rows pointing at the same careers site, or a re-scan after the filters changed) costs
+    a sha1 instead of a parse.
+    """
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def extract(self, content, inside_li=False):
+        key = (hashlib.sha1(content).digest(), inside_li)
+        links = self._cache.get(key)
+        if links is not None:
+            self._cache.move_to_end(key)
+            return links
+        links = _extract(content.decode('utf-8', errors='replace'), inside_li)
+        self._cache[key] = links
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return links
+
+
+extract_links = LinkExtractor().extract
@@ -0,0 +1,82 @@
+import functools
+import re
+
+from jobscraper.matching import trie_pattern
+
+US_KEYWORDS = [
+    'united states', 'usa', 'us', 'remote - us', 'remote usa', 'remote (us)'
+]
+
+# Full state names
+US_STATES = [
+    'alabama', 'alaska', 'arizona', 'arkansas', 'california', 'colorado', 'connecticut', 'delaware',
+    'florida', 'georgia', 'hawaii', 'idaho', 'illinois', 'indiana', 'iowa', 'kansas', 'kentucky',
+    'louisiana', 'maine', 'maryland', 'massachusetts', 'michigan', 'minnesota', 'mississippi',
+    'missouri', 'montana', 'nebraska', 'nevada', 'new hampshire', 'new jersey', 'new mexico',
+    'new york', 'north carolina', 'north dakota', 'ohio', 'oklahoma', 'oregon', 'pennsylvania',
+    'rhode island', 'south carolina', 'south dakota', 'tennessee', 'texas', 'utah', 'vermont',
+    'virginia', 'washington', 'west virginia', 'wisconsin', 'wyoming'
+]
+
+# State abbreviations
+US_STATE_ABBREVIATIONS = [
+    'al', 'ak', 'az', 'ar', 'ca', 'co', 'ct', 'de', 'fl', 'ga', 'hi', 'id', 'il', 'in', 'ia', 'ks', 'ky',
+    'la', 'me', 'md', 'ma', 'mi', 'mn', 'ms', 'mo', 'mt', 'ne', 'nv', 'nh', 'nj', 'nm', 'ny', 'nc', 'nd',
+    'oh', 'ok', 'or', 'pa', 'ri', 'sc', 'sd', 'tn', 'tx', 'ut', 'vt', 'va', 'wa', 'wv', 'wi', 'wy'
+]
+
+# Boards join several offices into one string: "Los Angeles, CA; San Francisco, CA",
+# "Austin | Remote", "New York / London"
+_SEPARATORS = re.compile(r'\s*[;|]\s*|\s+/\s+')
+
+CACHE_SIZE = 4096
+
+
+class LocationClassifier:
+    """US-location check with its tables compiled into one regex at construction time.
+
+    Location strings repeat heavily across postings, so verdicts are memoized in a
+    bounded LRU keyed by the normalized string; cache_stats() reports how much work that
+    saved over a sweep.
+    """
+
+    def __init__(self, keywords=US_KEYWORDS, states=US_STATES, abbreviations=US_STATE_ABBREVIATIONS,
+                 cache_size=CACHE_SIZE):
+        # Keywords and state names match anywhere, abbreviations only as whole words; the
+        # old ',\s*usa?$' suffix rules are covered by the 'us' keyword.
+        self.pattern = re.compile(
+            f"{trie_pattern(set(keywords) | set(states))}|\\b(?:{trie_pattern(abbreviations)})\\b"
+        )
+        self._parse = functools.lru_cache(maxsize=cache_size)(self._parse_normalized)
+
+    @staticmethod
+    def normalize(location):
+        return ' '.join(location.lower().split())
+
+    def _parse_normalized(self, location):
+        return tuple(
+            (part, self.pattern.search(part) is not None)
+            for part in _SEPARATORS.split(location) if part
+        )
+
+    def parse(self, location):
+        """Split a location string into its components, each flagged as US or not."""
+        if not location:
+            return ()
+        return self._parse(self.normalize(location))
+
+    def is_us(self, location):
+        # Postings without a location are kept, as before
+        if not location:
+            return True
+        return any(is_us for _, is_us in self.parse(location))
+
+    def cache_stats(self):
+        info = self._parse.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,65 @@
+import re
+
+_NOT_WORD = '(?![a-z0-9])'
+_NOT_WORD_BEHIND = '(?<![a-z0-9])'
+
+
+def trie_pattern(terms):
+    # Python's re tries alternation branches one after another, so factor the terms into
+    # a prefix trie: at each position only branches sharing the next character are tried.
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = []
+        optional = False
+        for ch, child in sorted(node.items()):
+            if ch == '':
+                optional = True
+            else:
+                branches.append(re.escape(ch) + build(child))
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f'(?:{pattern})?' if optional else pattern
+
+    return build(trie)
+
+
+def _terms_pattern(terms, whole_words):
+    terms = {t.lower() for t in terms}
+    parts = []
+    substrings = sorted(terms - whole_words)
+    if substrings:
+        parts.append(trie_pattern(substrings))
+    words = sorted(terms & whole_words)
+    if words:
+        parts.append(f'{_NOT_WORD_BEHIND}{trie_pattern(words)}{_NOT_WORD}')
+    return '|'.join(parts)
+
+
+class TitleMatcher:
+    """Positive/negative title filter compiled once from the keyword lists.
+
+    Both lists are folded into one regex, `^(?!.*NEG).*?POS`, so a title is classified by
+    a single match() call instead of a Python-level loop over every keyword. Terms in
+    `whole_words` only match as standalone words ('ui' matches "UI Engineer", not
+    "Build Engineer").
+    """
+
+    def __init__(self, keywords, no_keywords, whole_words=()):
+        whole_words = {w.lower() for w in whole_words}
+        positive = _terms_pattern(keywords, whole_words)
+        negative = _terms_pattern(no_keywords, whole_words)
+        pattern = f'(?!.*(?:{negative}))' if negative else ''
+        pattern += f'.*?(?:{positive})' if positive else '(?!)'
+        self.pattern = re.compile(pattern, re.DOTALL)
+
+    def match(self, title):
+        if not title:
+            return False
+        return self.pattern.match(title.lower()) is not None
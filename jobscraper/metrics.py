@@ -0,0 +1,212 @@
+import contextvars
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Metrics of the company being scraped in the current task; set by scrape_company and
+# picked up by the fetcher, response parsing and log_error.
+current_metrics = contextvars.ContextVar('current_metrics', default=None)
+
+# Upper bounds (seconds) of the HTTP latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+
+
+def log_error(message):
+    print(f"[ERROR] {message}")
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.errors.append(message)
+
+
+def record_parse(seconds):
+    # One listing response decoded in `seconds` of CPU time
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.pages += 1
+        metrics.parse_seconds += seconds
+
+
+@contextmanager
+def timed_parse():
+    # Wraps decoding of one listing response: counts it as a page and its parse time
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_parse(time.perf_counter() - start)
+
+
+class CompanyMetrics:
+    def __init__(self, company, platform, board=None):
+        self.company = company
+        self.platform = platform
+        # companies.board_key() of the row, which identifies the board across runs
+        self.board = board
+        self.requests = 0
+        self.pages = 0
+        self.bytes = 0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.postings_seen = 0
+        self.postings_kept = 0
+        self.status_codes = Counter()
+        # Requests refused because the host's circuit breaker was open
+        self.short_circuited = 0
+        # Responses the response cache reported as unchanged since the last run
+        self.not_modified = 0
+        # Keys of the response-cache entries this board updated (see ResponseCache.discard)
+        self.cache_keys = []
+        self.errors = []
+        self.started = time.perf_counter()
+        # When the board's first request got a host slot (set by the fetcher). Every board
+        # is started at once, so time before that was spent queueing behind other boards.
+        self.active_since = None
+        self.queued = 0.0
+        self.duration = None
+
+    def observe_request(self, latency, nbytes, status):
+        self.requests += 1
+        self.bytes += nbytes
+        self.latency_seconds += latency
+        self.status_codes[status] += 1
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.latency_buckets[i] += 1
+                break
+
+    def finish(self):
+        end = time.perf_counter()
+        active_since = self.active_since or end
+        self.queued = active_since - self.started
+        self.duration = end - active_since
+
+    def to_dict(self):
+        return {
+            'company': self.company,
+            'platform': self.platform,
+            'duration_s': round(self.duration or 0.0, 4),
+            'queued_s': round(self.queued, 4),
+            'requests': self.requests,
+            'pages': self.pages,
+            'bytes': self.bytes,
+            'latency_s': round(self.latency_seconds, 4),
+            'latency_histogram': dict(zip(map(str, LATENCY_BUCKETS), self.latency_buckets)),
+            'parse_s': round(self.parse_seconds, 4),
+            'postings_seen': self.postings_seen,
+            'postings_kept': self.postings_kept,
+            'status_codes': {str(k): v for k, v in self.status_codes.items()},
+            'short_circuited': self.short_circuited,
+            'not_modified': self.not_modified,
+            'errors': self.errors,
+        }
+
+
+class RunMetrics:
+    """Collects a CompanyMetrics per scraped board and renders the run report."""
+
+    def __init__(self):
+        self.companies = []
+        self.started = time.time()
+        self.finished = None
+        # Expected makespans from CostHistory.order(), when the sweep was ordered by cost
+        self.plan = None
+
+    def start(self, company, platform, board=None):
+        metrics = CompanyMetrics(company, platform, board)
+        self.companies.append(metrics)
+        return metrics
+
+    def finish(self):
+        self.finished = time.time()
+
+    def by_platform(self):
+        totals = {}
+        for m in self.companies:
+            t = totals.setdefault(m.platform, {
+                'companies': 0, 'duration_s': 0.0, 'requests': 0, 'pages': 0, 'bytes': 0, 'latency_s': 0.0,
+                'latency_buckets': [0] * len(LATENCY_BUCKETS), 'parse_s': 0.0, 'postings_seen': 0,
+                'postings_kept': 0, 'errors': 0,
+            })
+            t['companies'] += 1
+            t['duration_s'] += m.duration or 0.0
+            t['requests'] += m.requests
+            t['pages'] += m.pages
+            t['bytes'] += m.bytes
+            t['latency_s'] += m.latency_seconds
+            t['latency_buckets'] = [a + b for a, b in zip(t['latency_buckets'], m.latency_buckets)]
+            t['parse_s'] += m.parse_seconds
+            t['postings_seen'] += m.postings_seen
+            t['postings_kept'] += m.postings_kept
+            t['errors'] += len(m.errors)
+        for t in totals.values():
+            t['match_rate'] = t['postings_kept'] / t['postings_seen'] if t['postings_seen'] else 0.0
+        return totals
+
+    def slowest(self, n):
+        return sorted(self.companies, key=lambda m: m.duration or 0.0, reverse=True)[:n]
+
+    def to_report(self):
+        return {
+            'started': self.started,
+            'finished': self.finished,
+            'wall_s': round((self.finished or time.time()) - self.started, 3),
+            'plan': self.plan,
+            'platforms': self.by_platform(),
+            'companies': [m.to_dict() for m in self.companies],
+        }
+
+    def write_json(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_report(), indent=2))
+
+    def write_prometheus(self, path):
+        """Write a node_exporter textfile-collector file (written to a temp file, then renamed)."""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+        platforms = self.by_platform()
+        for key, help_text in [
+            ('requests', 'HTTP requests made'), ('pages', 'Listing pages parsed'), ('bytes', 'Response bytes read'),
+            ('postings_seen', 'Postings returned by the boards'),
+            ('postings_kept', 'Postings passing the title and location filters'), ('errors', 'Scrape errors'),
+        ]:
+            metric(f'jobscraper_{key}_total', 'counter', f'{help_text}, per platform',
+                   [({'platform': p}, t[key]) for p, t in platforms.items()])
+        metric('jobscraper_parse_seconds_total', 'counter', 'Time spent decoding responses, per platform',
+               [({'platform': p}, round(t['parse_s'], 6)) for p, t in platforms.items()])
+
+        name = 'jobscraper_http_request_duration_seconds'
+        lines.append(f'# HELP {name} HTTP request latency, per platform')
+        lines.append(f'# TYPE {name} histogram')
+        for p, t in platforms.items():
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, t['latency_buckets']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else bound
+                lines.append(f'{name}_bucket{{platform="{_escape(p)}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{platform="{_escape(p)}"}} {round(t["latency_s"], 6)}')
+            lines.append(f'{name}_count{{platform="{_escape(p)}"}} {t["requests"]}')
+
+        metric('jobscraper_company_duration_seconds', 'gauge',
+               'Time from the first admitted request to the end of each board in the last run',
+               [({'company': m.company, 'platform': m.platform}, round(m.duration or 0.0, 4))
+                for m in self.companies])
+        metric('jobscraper_last_run_timestamp_seconds', 'gauge', 'When the last run finished',
+               [({}, round(self.finished or time.time(), 3))])
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_text('\n'.join(lines) + '\n')
+        tmp.replace(path)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,170 @@
+import hashlib
+import random
+import re
+import time
+import unicodedata
+from array import array
+
+from jobscraper.state import connect
+
+# MinHash signature length, split into BANDS bands of ROWS values for the LSH index.
+# Two postings share a bucket in some band with probability 1 - (1 - s**ROWS)**BANDS for
+# Jaccard similarity s: ~100% at 0.8, ~64% at 0.5, so candidates are then checked
+# against THRESHOLD with their exact shingle sets.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# Jaccard similarity of the shingle sets from which a posting counts as a clone of an earlier one
+THRESHOLD = 0.8
+
+_MERSENNE = (1 << 61) - 1
+# Fixed seed: signatures are persisted, so the permutations must not change between runs
+_rng = random.Random(0x6a6f6273)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+
+_ABBREVIATIONS = {'sr': 'senior', 'snr': 'senior', 'jr': 'junior', 'mgr': 'manager', 'eng': 'engineer',
+                  'dev': 'developer', 'ops': 'operations'}
+_STOPWORDS = {'a', 'an', 'and', 'the', 'of', 'for', 'to', 'in', 'at', 'with'}
+# Postings indexed between flushes while importing an existing archive
+MIGRATION_BATCH = 5000
+
+# Requisition numbers and years ("R-12345", "(2024)") differ between reposts of one role
+_REQUISITION = re.compile(r'\b[a-z]*\d{4,}[a-z0-9]*\b')
+
+
+def _tokens(text):
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode().lower()
+    text = _REQUISITION.sub(' ', text)
+    words = (_ABBREVIATIONS.get(word, word) for word in re.findall(r'[a-z0-9+#]+', text))
+    return [word for word in words if word not in _STOPWORDS]
+
+
+def shingles(record):
+    """Title words and word pairs, plus the location as one shingle: reposts that differ
+    in punctuation, abbreviations or requisition number keep all of their shingles, and
+    a long title cloned to another location still clears THRESHOLD (a short, generic
+    one like "Backend Engineer" doesn't)."""
+    title = _tokens(record['title'])
+    found = set(title)
+    found.update(f'{a} {b}' for a, b in zip(title, title[1:]))
+    location = record.get('location')
+    if location and location != 'N/A':
+        found.add('loc:' + ' '.join(_tokens(str(location))))
+    return found
+
+
+def signature(shingle_set):
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'big') for s in shingle_set]
+    if not hashes:
+        return array('Q', [_MERSENNE] * NUM_PERM)
+    return array('Q', (min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMUTATIONS))
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def _buckets(company, sig):
+    # Company is part of every bucket key: postings are only ever clones within a company
+    for band in range(BANDS):
+        values = sig[band * ROWS:(band + 1) * ROWS].tobytes()
+        key = hashlib.blake2b(f'{company}\x1f{band}\x1f'.encode() + values, digest_size=8).digest()
+        yield int.from_bytes(key, 'big', signed=True)
+
+
+class NearDuplicateIndex:
+    """LSH index over the MinHash signatures of every posting reported so far.
+
+    match() looks a posting up in BANDS buckets and compares it with the few postings
+    found there only, so the cost per posting stays flat as the index grows instead of
+    scanning the archive pairwise. Like SeenLinks, new entries are buffered (and already
+    visible to match()) until flush().
+    """
+
+    def __init__(self, path='near_duplicates.sqlite3', threshold=THRESHOLD):
+        self.db = connect(path)
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS postings (link TEXT PRIMARY KEY, title TEXT, location TEXT, added REAL)'
+        )
+        self.db.execute('CREATE TABLE IF NOT EXISTS buckets (bucket INTEGER, link TEXT)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS buckets_bucket ON buckets (bucket)')
+        self.db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self.threshold = threshold
+        self._pending = {}
+        self._pending_buckets = {}
+
+    def _candidates(self, buckets):
+        links = set()
+        for bucket in buckets:
+            links.update(self._pending_buckets.get(bucket, ()))
+        placeholders = ','.join('?' * len(buckets))
+        links.update(link for link, in self.db.execute(
+            f'SELECT DISTINCT link FROM buckets WHERE bucket IN ({placeholders})', buckets))
+        return links
+
+    def _shingles_of(self, link):
+        if link in self._pending:
+            return self._pending[link][1]
+        found = self.db.execute('SELECT title, location FROM postings WHERE link = ?', (link,)).fetchone()
+        return shingles({'title': found[0], 'location': found[1]}) if found else None
+
+    def match(self, record):
+        """Link of an indexed posting `record` is a near-duplicate of, else None; when
+        there is none, `record` is indexed under its own link."""
+        found = shingles(record)
+        buckets = list(_buckets(record['company'], signature(found)))
+        best, best_score, indexed = None, self.threshold, False
+        for link in self._candidates(buckets):
+            if link == record['link']:
+                indexed = True
+                continue
+            other = self._shingles_of(link)
+            if other is None:
+                continue
+            score = jaccard(found, other)
+            if score >= best_score:
+                best, best_score = link, score
+        if best is None and not indexed:
+            self._pending[record['link']] = (record, found, buckets)
+            for bucket in buckets:
+                self._pending_buckets.setdefault(bucket, []).append(record['link'])
+        return best
+
+    def migrate(self, source, records):
+        """One-time import of the postings in an existing archive (`records`, named by
+        `source`), so reposts of roles reported before the index existed are caught too;
+        no-op once done. Returns the number of postings indexed."""
+        marker = f'migrated:{source}'
+        if self.db.execute('SELECT 1 FROM meta WHERE key = ?', (marker,)).fetchone():
+            return 0
+        imported = 0
+        for record in records:
+            # Updated and closed rows repeat a link; duplicates already matched an earlier row
+            if not record.get('link') or record.get('change') not in (None, '', 'new'):
+                continue
+            if self.match(record) is None and record['link'] in self._pending:
+                imported += 1
+            if len(self._pending) >= MIGRATION_BATCH:
+                self.flush()
+        self.flush()
+        with self.db:
+            self.db.execute('INSERT INTO meta VALUES (?, ?)', (marker, str(time.time())))
+        return imported
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM postings').fetchone()[0] + len(self._pending)
+
+    def flush(self):
+        now = time.time()
+        with self.db:
+            self.db.executemany('INSERT OR IGNORE INTO postings VALUES (?, ?, ?, ?)',
+                                ((link, record['title'], record.get('location'), now)
+                                 for link, (record, _, _) in self._pending.items()))
+            self.db.executemany('INSERT INTO buckets VALUES (?, ?)',
+                                ((bucket, link) for link, (_, _, buckets) in self._pending.items()
+                                 for bucket in buckets))
+        self._pending.clear()
+        self._pending_buckets.clear()
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,75 @@
+import csv
+import time
+
+from jobscraper.companies import board_key
+from jobscraper.state import connect
+
+# Consecutive failed runs before a board starts being skipped, and the skip period:
+# BASE_BACKOFF after reaching the threshold, doubling with every further failure.
+FAILURE_THRESHOLD = 3
+BASE_BACKOFF = 24 * 60 * 60
+MAX_BACKOFF = 30 * 24 * 60 * 60
+
+
+class NegativeCache:
+    """Persisted record of boards that keep failing (404s, invalid URLs, dead hosts).
+
+    A board that failed FAILURE_THRESHOLD runs in a row is skipped until its backoff
+    expires, then tried again; one success clears it. report() lists the boards that are
+    currently failing so the companies list can be cleaned up.
+    """
+
+    def __init__(self, path='negative_cache.sqlite3'):
+        self.db = connect(path)
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS boards ('
+            'key TEXT PRIMARY KEY, company TEXT, platform TEXT, careers_url TEXT, failures INTEGER, '
+            'last_error TEXT, last_failure REAL, skip_until REAL)'
+        )
+
+    def should_skip(self, row):
+        found = self.db.execute('SELECT skip_until FROM boards WHERE key = ?', (board_key(row),)).fetchone()
+        return found is not None and found[0] is not None and found[0] > time.time()
+
+    def record_failure(self, row, error):
+        key = board_key(row)
+        found = self.db.execute('SELECT failures FROM boards WHERE key = ?', (key,)).fetchone()
+        failures = (found[0] if found else 0) + 1
+        now = time.time()
+        skip_until = None
+        if failures >= FAILURE_THRESHOLD:
+            skip_until = now + min(BASE_BACKOFF * 2 ** (failures - FAILURE_THRESHOLD), MAX_BACKOFF)
+        with self.db:
+            self.db.execute(
+                'INSERT OR REPLACE INTO boards VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, row['company'], row['platform'].lower(), row['careers_url'], failures, error, now, skip_until),
+            )
+
+    def record_success(self, row):
+        with self.db:
+            self.db.execute('DELETE FROM boards WHERE key = ?', (board_key(row),))
+
+    def report(self):
+        cursor = self.db.execute(
+            'SELECT company, platform, careers_url, failures, last_error, last_failure, skip_until '
+            'FROM boards ORDER BY failures DESC, company'
+        )
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def write_report(self, path):
+        rows = self.report()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, ['company', 'platform', 'careers_url', 'failures', 'last_error',
+                                        'last_failure', 'skip_until'])
+            writer.writeheader()
+            for row in rows:
+                row['last_failure'] = time.strftime('%Y-%m-%d %H:%M', time.localtime(row['last_failure']))
+                if row['skip_until']:
+                    row['skip_until'] = time.strftime('%Y-%m-%d %H:%M', time.localtime(row['skip_until']))
+                writer.writerow(row)
+        return rows
+
+    def close(self):
+        self.db.close()
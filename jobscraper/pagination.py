@@ -0,0 +1,82 @@
+import asyncio
+
+
+class Unchanged:
+    """A decoded page the response cache reports as unchanged since the last run."""
+
+    def __init__(self, page):
+        self.page = page
+
+
+def _count(page, items):
+    # Postings the page held: parse() may have dropped the ones the filters reject
+    return page.get('postings', len(items))
+
+
+def _unwrap(page):
+    # (page, unchanged?) for whatever fetch_page returned
+    if isinstance(page, Unchanged):
+        return page.page, True
+    return page, False
+
+
+async def paginate(fetch_page, page_size, items_of, total_of, next_token_of=None, first=None):
+    """Yield every item of a paged listing.
+
+    fetch_page(offset, token) returns one decoded page (a dict), None when the response cache says
+    the page is unchanged since the last run, or raises. Pages that are needed even when
+    unchanged -- the first one, which holds the total, and every page of a cursor-based
+    API, which holds the next token -- are fetched unconditionally instead and wrapped
+    in Unchanged when they are. The total is read from the first page only, so we stop
+    as soon as the board is exhausted. Offset-based APIs then have all remaining pages
+    requested concurrently -- the fetcher's rate limiter
+    and per-host pool keep that within budget. If some of those fail, the rest are still
+    yielded before the first error is raised. Cursor-based APIs (next_token_of given)
+    can only be walked one page at a time.
+
+    Pass `first` when the caller already holds page one (e.g. after probing an endpoint).
+
+    An unchanged page's postings were all handled by an earlier run (the cache only keeps
+    pages of boards that finished cleanly), so its items are skipped; the other pages are
+    still walked, since nothing guarantees that boards list their newest postings first.
+    """
+    if first is None:
+        first = await fetch_page(0, None)
+    first, unchanged = _unwrap(first)
+    total = total_of(first) or 0
+    items = items_of(first)
+    if not unchanged:
+        for item in items:
+            yield item
+
+    if next_token_of is not None:
+        count = seen = _count(first, items)
+        token = next_token_of(first)
+        while token and count and seen < total:
+            page, unchanged = _unwrap(await fetch_page(seen, token))
+            items = items_of(page)
+            count = _count(page, items)
+            seen += count
+            token = next_token_of(page)
+            if not unchanged:
+                for item in items:
+                    yield item
+        return
+
+    if _count(first, items) < page_size:
+        return
+    offsets = range(page_size, total, page_size)
+    # One failed page mustn't cost the others: yield every page that arrived, then raise
+    # the first error so the caller still treats the board as incomplete
+    pages = await asyncio.gather(*(fetch_page(offset, None) for offset in offsets), return_exceptions=True)
+    error = None
+    for page in pages:
+        if isinstance(page, Exception):
+            error = error or page
+            continue
+        if page is None:
+            continue
+        for item in items_of(page):
+            yield item
+    if error is not None:
+        raise error
@@ -0,0 +1,102 @@
+import asyncio
+import contextvars
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from jobscraper.metrics import current_metrics, record_parse, timed_parse
+
+# Parse pool of the sweep running in the current task; None parses in the event loop.
+current_pool = contextvars.ContextVar('current_pool', default=None)
+# Title/location rules (a sweep.Filters) of the board scraped in the current task; when
+# set, parse() only returns the postings they keep.
+current_filters = contextvars.ContextVar('current_filters', default=None)
+
+# Bodies smaller than this are decoded in the event loop: shipping them to a worker and
+# the records back costs more than the parse itself.
+MIN_OFFLOAD_BYTES = 64 * 1024
+
+
+# Filters rebuilt in this worker process, by their rules
+_worker_filters = {}
+
+
+def _keep_matching(result, filters):
+    # (result with only the postings `filters` keeps, number dropped). A page has one list
+    # of postings; how many it held is kept under 'postings' for paginate().
+    if isinstance(result, list):
+        kept = [record for record in result if filters.keep(record)]
+        return kept, len(result) - len(kept)
+    dropped = 0
+    for key, value in list(result.items()):
+        if isinstance(value, list):
+            result['postings'] = len(value)
+            result[key], dropped = _keep_matching(value, filters)
+    return result, dropped
+
+
+def _timed_call(fn, content, args, rules):
+    start = time.perf_counter()
+    result, dropped = fn(content, *args), 0
+    if rules is not None:
+        filters = _worker_filters.get(rules)
+        if filters is None:
+            from jobscraper.sweep import Filters
+            filters = _worker_filters[rules] = Filters(*rules)
+        result, dropped = _keep_matching(result, filters)
+    return result, dropped, time.perf_counter() - start
+
+
+class ParsePool:
+    """Worker processes for the CPU-bound stage of a sweep.
+
+    The event loop does the I/O -- fetching raw bodies over the shared connection pool --
+    and hands each large body to a worker, which decodes it, applies the board's title
+    and location rules and sends back the kept job_records only. JSON decoding, HTML
+    scanning and the filter regexes then scale with CPU cores instead of sharing one
+    under the GIL.
+    """
+
+    def __init__(self, workers=None, min_offload_bytes=MIN_OFFLOAD_BYTES):
+        # spawn rather than fork: the parent has a running event loop and resolver threads
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        self.min_offload_bytes = min_offload_bytes
+
+    async def run(self, fn, content, *args, rules=None):
+        """Return (fn(content, *args) filtered by the Filters built from `rules`, number
+        of postings dropped)."""
+        loop = asyncio.get_running_loop()
+        result, dropped, seconds = await loop.run_in_executor(self._executor, _timed_call, fn, content, args, rules)
+        record_parse(seconds)
+        return result, dropped
+
+    def close(self):
+        self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+async def parse(fn, content, *args):
+    """Return fn(content, *args), run in the sweep's parse pool when the body is large.
+
+    `fn` has to be a module-level function (it is pickled by name) that turns a raw body
+    into job_records, or a page of them with its paging fields. With current_filters set
+    only the postings they keep are returned, and the rest are counted as seen here.
+    """
+    pool = current_pool.get()
+    filters = current_filters.get()
+    if pool is None or len(content) < pool.min_offload_bytes:
+        with timed_parse():
+            result, dropped = fn(content, *args), 0
+            if filters is not None:
+                result, dropped = _keep_matching(result, filters)
+    else:
+        result, dropped = await pool.run(fn, content, *args, rules=filters.rules if filters is not None else None)
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.postings_seen += dropped
+    return result
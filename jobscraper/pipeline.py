@@ -0,0 +1,164 @@
+import asyncio
+import csv
+from collections import Counter
+
+# Column order of output.csv and the archive. `change` is new, updated, closed or
+# reopened (see jobscraper.snapshots and _accept()); records without one are treated as
+# new. Archive rows can also be `duplicate`: near-duplicates of a posting already
+# reported (see jobscraper.neardup).
+FIELDS = ['company', 'title', 'location', 'link', 'postedOn', 'updatedOn', 'change']
+
+QUEUE_SIZE = 1000
+# Rows written between flushes of the output files and the seen-links index
+FLUSH_EVERY = 200
+
+
+def job_record(company, title, location, link, postedOn=None, updatedOn=None, change=None):
+    return {'company': company, 'title': title, 'location': location, 'link': link, 'postedOn': postedOn,
+            'updatedOn': updatedOn, 'change': change}
+
+
+def _accept(record, seen):
+    # Updates and closures are always reported; anything else only if its link is new,
+    # or if the board's snapshot says it is new: a posting that closed and came back
+    # under the same link is reported again as reopened
+    change = record.get('change')
+    if change in ('updated', 'closed'):
+        return True
+    if record['link'] in seen:
+        if change != 'new':
+            return False
+        record['change'] = 'reopened'
+        return True
+    record['change'] = 'new'
+    return True
+
+
+class ResultWriter:
+    """Single consumer of scraped records: drops links already seen and streams the rest
+    to output.csv and the archive, flushing as it goes so a crash keeps partial output.
+    `archive` is a CsvArchive or ParquetArchive (see jobscraper.archive), or None to write
+    only the output file (shard runs, see shard.py); the writer closes it.
+
+    Updated, closed and reopened postings are written even though their link was seen
+    before; in the archive a closed row marks the end of that posting. With a NearDuplicateIndex as
+    `near_duplicates`, new postings that are clones of one already reported (same role
+    under another link) are left out of output.csv and archived as `duplicate` rows."""
+
+    def __init__(self, seen, output_path, archive=None, near_duplicates=None):
+        self.seen = seen
+        self.output_path = output_path
+        self.archive = archive
+        self.near_duplicates = near_duplicates
+        self.written = 0
+        self.changes = Counter()
+        self._unflushed = 0
+
+    def __enter__(self):
+        self._output_file = open(self.output_path, 'w', newline='', encoding='utf-8')
+        self._output = csv.DictWriter(self._output_file, FIELDS)
+        self._output.writeheader()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush(force=True)
+        self._output_file.close()
+        if self.archive is not None:
+            self.archive.close()
+
+    def write(self, record):
+        link = record['link']
+        if not link or not _accept(record, self.seen):
+            return False
+        self.seen.add(link)
+        if (record['change'] == 'new' and self.near_duplicates is not None
+                and self.near_duplicates.match(record) is not None):
+            record['change'] = 'duplicate'
+        self.changes[record['change']] += 1
+        if record['change'] != 'duplicate':
+            self._output.writerow(record)
+            self.written += 1
+        if self.archive is not None:
+            self.archive.append(record)
+        self._unflushed += 1
+        if self._unflushed >= FLUSH_EVERY:
+            self.flush()
+        return record['change'] != 'duplicate'
+
+    def flush(self, force=False):
+        if not self._unflushed:
+            return
+        self._output_file.flush()
+        # Links only go into the seen index once their archive rows are on disk; an archive
+        # that batches its writes keeps them pending until it does (or until forced).
+        if self.archive is not None and not self.archive.flush(force):
+            return
+        self.seen.flush()
+        if self.near_duplicates is not None:
+            self.near_duplicates.flush()
+        self._unflushed = 0
+
+
+async def run_pipeline(producers, writer, queue_size=QUEUE_SIZE):
+    """Drain every async-iterable producer through a bounded queue into writer.
+
+    Producers block once the queue is full, so memory stays bounded however fast the
+    boards answer; the writer is the only code touching the output files and the seen
+    index, so there is nothing to race on. An error from the writer or a producer cancels
+    the rest of the pipeline and is raised here.
+    """
+    queue = asyncio.Queue(maxsize=queue_size)
+    done = object()
+
+    async def produce(records):
+        async for record in records:
+            await queue.put(record)
+
+    async def consume():
+        while True:
+            record = await queue.get()
+            if record is done:
+                return
+            writer.write(record)
+            if queue.empty():
+                writer.flush()
+
+    consumer = asyncio.create_task(consume())
+    producing = asyncio.ensure_future(asyncio.gather(*(produce(p) for p in producers)))
+    try:
+        # If the writer fails, the producers would block on the full queue forever: stop
+        # as soon as either side is done, and re-raise whichever failed.
+        await asyncio.wait([consumer, producing], return_when=asyncio.FIRST_COMPLETED)
+        if consumer.done():
+            consumer.result()
+        producing.result()
+        await queue.put(done)
+        await consumer
+    finally:
+        producing.cancel()
+        consumer.cancel()
+        await asyncio.gather(producing, consumer, return_exceptions=True)
+
+
+class RecordCollector:
+    """In-memory stand-in for ResultWriter, used by the library API: same dedup rules,
+    records are kept in a list instead of written out."""
+
+    def __init__(self, seen=None):
+        self.seen = set() if seen is None else seen
+        self.records = []
+
+    @property
+    def written(self):
+        return len(self.records)
+
+    def write(self, record):
+        link = record['link']
+        if not link or not _accept(record, self.seen):
+            return False
+        self.seen.add(link)
+        self.records.append(record)
+        return True
+
+    def flush(self, force=False):
+        pass
@@ -0,0 +1,53 @@
+import asyncio
+import contextvars
+import time
+
+# Platform of the company currently being scraped. scrape_company sets it once and every
+# request made from that task inherits it, so scrapers don't have to pass it around.
+current_platform = contextvars.ContextVar('current_platform', default=None)
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        # The lock queues waiters in arrival order; sleeping here suspends only the
+        # waiting task, never a connection or another platform's work.
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class RateLimiter:
+    """One token bucket per (platform, host), with limits configured per platform."""
+
+    def __init__(self, limits):
+        # limits: {platform: (requests_per_second, burst)}
+        self.limits = dict(limits)
+        self._buckets = {}
+
+    async def acquire(self, platform, host):
+        limit = self.limits.get(platform)
+        if limit is None:
+            return
+        key = (platform, host)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(*limit)
+            self._buckets[key] = bucket
+        await bucket.acquire()
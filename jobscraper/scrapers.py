@@ -0,0 +1,527 @@
+import json
+import re
+from datetime import datetime
+from urllib.parse import urljoin
+
+from jobscraper.capabilities import forget, probe_order, remember
+from jobscraper.fetch import current_fetcher
+from jobscraper.links import extract_links
+from jobscraper.metrics import log_error
+from jobscraper.pagination import Unchanged, paginate
+from jobscraper.parsepool import parse
+from jobscraper.pipeline import job_record
+
+# Scrapers yield every posting on a board as a job_record; keyword/location filtering and
+# dedup happen downstream (see jobscraper.sweep). HTML boards only need their links, which
+# jobscraper.links extracts without building a DOM. Bodies are decoded by module-level
+# *_records/*_page functions through parsepool.parse, which runs large ones in worker
+# processes when the sweep has a parse pool.
+
+
+# Lever serves each org from one of two regional APIs
+LEVER_API = {
+    'global': 'https://api.lever.co/v0/postings/{org}?mode=json',
+    'eu': 'https://api.eu.lever.co/v0/postings/{org}?mode=json',
+}
+
+
+class _CurrentFetcher:
+    # Resolves to the Fetcher of the sweep this scraper is running in
+    def __getattr__(self, name):
+        return getattr(current_fetcher.get(), name)
+
+
+fetcher = _CurrentFetcher()
+
+
+async def scrape_greenhouse_json(url, company):
+    # print(f"Scraping Greenhouse for {company}")
+    try:
+        # Extract org name from URL
+        match = re.search(r'greenhouse.io/([^/]+)', url)
+        if not match:
+            log_error(f"Could not extract Greenhouse company name for {company}")
+            return
+
+        org = match.group(1)
+        api_url = f"https://boards-api.greenhouse.io/v1/boards/{org}/jobs"
+        # Large boards embed full descriptions; stream them so only one posting is in memory
+        async with fetcher.stream('GET', api_url) as r:
+            if r.not_modified:
+                return
+            if r.status_code != 200:
+                log_error(f"Greenhouse API failed for {company}: {r.status_code}")
+                return
+            async for job in r.items('jobs.item'):
+                title = job['title']
+                location = job.get('location', {}).get('name', 'N/A')
+                link = job['absolute_url']
+                postedOn = job['first_published']
+                updatedOn = job['updated_at']
+                yield job_record(company, title, location, link, postedOn, updatedOn)
+    except Exception as e:
+        log_error(f"Greenhouse error for {company}: {e}")
+
+
+async def scrape_lever_json(url, company):
+    # print(f"Scraping Lever for {company}")
+    try:
+        # Extract org name from URL
+        match = re.search(r'lever.co/([^/]+)', url)
+        if not match:
+            log_error(f"Could not extract Lever company name for {company}")
+            return
+
+        org = match.group(1)
+        # The board URL hints at the region; once an API has answered for this org it is
+        # asked first, and the other one only if it no longer knows the org (404).
+        regions = ('eu', 'global') if re.search(r'eu.lever.co/([^/]+)', url) else ('global', 'eu')
+        for region in probe_order('lever', org, regions):
+            api_url = LEVER_API[region].format(org=org)
+            async with fetcher.stream('GET', api_url) as r:
+                if r.not_modified:
+                    return
+                if r.status_code == 404:
+                    continue
+                if r.status_code != 200:
+                    log_error(f"Lever API failed for {company}: {api_url} - {r.status_code}")
+                    return
+                remember('lever', org, region)
+                async for job in r.items('item'):
+                    title = job['text']
+                    location = job.get('categories', {}).get('location', 'N/A')
+                    created_at_raw = job.get('createdAt')
+                    postedOn = (
+                        datetime.utcfromtimestamp(created_at_raw / 1000).strftime('%Y-%m-%d %H:%M:%S')
+                        if created_at_raw else 'N/A'
+                    )
+                    updated_at_raw = job.get('updatedAt')
+                    updatedOn = (
+                        datetime.utcfromtimestamp(updated_at_raw / 1000).strftime('%Y-%m-%d %H:%M:%S')
+                        if updated_at_raw else 'N/A'
+                    )
+                    link = job['hostedUrl']
+                    yield job_record(company, title, location, link, postedOn, updatedOn)
+                return
+        forget('lever', org)
+        log_error(f"Lever API failed for {company}: {org} not found in any region (404)")
+    except Exception as e:
+        log_error(f"Lever error for {company}: {e}")
+
+
+async def scrape_ashby(url, company):
+    # Not tested
+    # print(f"Scraping Ashby for {company}")
+    try:
+        match = re.search(r'careers\.([\w\-]+)\.com', url)
+        if not match:
+            log_error(f"Invalid Ashby URL: {url}")
+            return
+        domain = match.group(1)
+        api_url = f"https://careers.{domain}.com/api/jobs"
+        r = await fetcher.get(api_url)
+        if r.not_modified:
+            return
+        if r.status_code != 200:
+            log_error(f"Ashby API failed for {company}: {r.status_code}")
+            return
+        for record in await parse(_ashby_records, r.content, company, domain):
+            yield record
+    except Exception as e:
+        log_error(f"Ashby scraping failed for {company}: {e}")
+
+
+def _ashby_records(content, company, domain):
+    records = []
+    for job in json.loads(content).get('jobs', []):
+        title = job.get('title', '')
+        location = job.get('location', 'N/A')
+        link = f"https://careers.{domain}.com/jobs/{job['id']}"
+        records.append(job_record(company, title, location, link))
+    return records
+
+
+async def scrape_ashbyhq_hosted(url, company):
+    # print(f"Scraping Ashby REST API for {company}")
+    try:
+        match = re.search(r'ashbyhq\.com/([\w\-]+)', url)
+        if not match:
+            log_error(f"Invalid AshbyHQ URL: {url}")
+            return
+        org = match.group(1)
+
+        api_url = f"https://api.ashbyhq.com/posting-api/job-board/{org}"
+        async with fetcher.stream('GET', api_url) as response:
+            if response.not_modified:
+                return
+            if response.status_code != 200:
+                body = (await response.read()).decode('utf-8', errors='replace')
+                log_error(f"Ashby API failed for {company} - HTTP {response.status_code}: {body}")
+                return
+
+            async for job in response.items('jobs.item'):
+                title = job.get('title', '')
+                location = job.get('location', 'N/A')
+                link = job.get('jobUrl', '')
+                posted_raw = job.get('publishedAt')
+                # posted_date = (
+                #     datetime.fromisoformat(posted_raw.rstrip("Z")).strftime('%Y-%m-%d')
+                #     if posted_raw else 'N/A'
+                # )
+
+                yield job_record(company, title, location, link, posted_raw)
+    except Exception as e:
+        log_error(f"Ashby REST API scraping failed for {company}: {e}")
+
+
+async def scrape_breezy(url, company):
+    # print(f"Scraping Breezy for {company}")
+    try:
+        match = re.search(r'https?://([\w\-]+)\.breezy\.hr', url)
+        if not match:
+            log_error(f"Invalid Breezy URL for {company}: {url}")
+            return
+        org = match.group(1)
+        api_url = f"https://{org}.breezy.hr/json"
+        r = await fetcher.get(api_url)
+        if r.not_modified:
+            return
+        if r.status_code != 200:
+            log_error(f"Breezy API failed for {company}: {r.status_code}")
+            return
+        for record in await parse(_breezy_records, r.content, company):
+            yield record
+    except Exception as e:
+        log_error(f"Breezy: {e}")
+
+
+def _breezy_records(content, company):
+    records = []
+    for job in json.loads(content):
+        title = job.get('name')
+        location = job.get('location', 'N/A').get('name', 'N/A')
+        postedOn = job.get('published_date', '')
+        link = job.get('url')
+        records.append(job_record(company, title, location, link, postedOn))
+    return records
+
+
+async def scrape_smartrecruiters(url, company):
+    # print(f"Scraping SmartRecruiters for {company}")
+    try:
+        # match = re.search(r'company/([^/]+)', url)
+        # org = match.group(1)
+        api_url = f"https://api.smartrecruiters.com/v1/companies/{company}/postings"
+        page_size = 100
+
+        async def fetch_page(offset, token):
+            # The first page is always fetched whole: the total comes from it
+            r = await fetcher.get(api_url, params={'limit': page_size, 'offset': offset}, conditional=offset > 0)
+            if r.not_modified and offset:
+                return None
+            if r.status_code != 200:
+                raise Exception(f"API failed for {company}: {r.status_code}")
+            page = await parse(_smartrecruiters_page, r.content, company)
+            return Unchanged(page) if r.not_modified else page
+
+        async for record in paginate(fetch_page, page_size, lambda d: d['content'], lambda d: d['totalFound']):
+            yield record
+    except Exception as e:
+        log_error(f"SmartRecruiters: {e}")
+
+
+def _smartrecruiters_page(content, company):
+    # The page's paging fields, with its postings already turned into job_records
+    data = json.loads(content)
+    records = []
+    for job in data.get('content', []):
+        title = job.get('name')
+        location = job.get('location', {}).get('city', 'N/A')
+        postedOn = job.get('releasedDate')
+        link = f"https://www.smartrecruiters.com/{company}/{job.get('id')}"
+        records.append(job_record(company, title, location, link, postedOn))
+    return {'totalFound': data.get('totalFound', 0), 'content': records}
+
+
+async def scrape_recruiterbox(url, company):
+    # No tested
+    # print(f"Scraping Recruiterbox for {company}")
+    try:
+        r = await fetcher.get(url)
+        if r.not_modified:
+            return
+        if r.status_code != 200:
+            log_error(f"Recruiterbox API failed for {company}: {r.status_code}")
+            return
+        for record in await parse(_recruiterbox_records, r.content, url, company):
+            yield record
+    except Exception as e:
+        log_error(f"Recruiterbox: {e}")
+
+
+def _recruiterbox_records(content, url, company):
+    records = []
+    for link, title in extract_links(content, inside_li=True):
+        if not link.startswith("http"):
+            link = url.rstrip("/") + "/" + link.lstrip("/")
+        # No location on these boards; None tells the filter not to apply the US check
+        records.append(job_record(company, title, None, link))
+    return records
+
+
+async def scrape_workable(url, company):
+    # print(f"Scraping Workable for {company}")
+    try:
+        match = re.search(r'workable\.com/([^/]+)/?', url)
+        if not match:
+            log_error(f"Invalid Workable URL for {company}: {url}")
+            return
+        org = match.group(1)
+
+        headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json"
+        }
+
+        # v3 lists jobs with a POST; some tenants only answer the older v1 GET
+        v3_url = f"https://apply.workable.com/api/v3/accounts/{org}/jobs"
+        payload = {
+            "query": "",
+            # "limit": 100,
+            # "offset": 0
+        }
+
+        async def fetch_page(offset, token):
+            # Every v3 page holds the cursor to the next one, so none is fetched conditionally
+            r = await fetcher.post(v3_url, headers=headers, json=dict(payload, token=token), conditional=False)
+            if r.status_code != 200:
+                raise Exception(f"v3 page at offset {offset} failed: {r.status_code}")
+            page = await parse(_workable_v3_page, r.content, company, org)
+            return Unchanged(page) if r.not_modified else page
+
+        v1_url = f"https://apply.workable.com/api/v1/accounts/{org}/jobs"
+
+        # The version that answered last time is tried first; the other only if it fails
+        failures = []
+        for api in probe_order('workable', org, ('v3', 'v1')):
+            if api == 'v3':
+                # Fetched whole even if unchanged: the next page's cursor is in it
+                r = await fetcher.post(v3_url, headers=headers, json=payload, conditional=False)
+            else:
+                r = await fetcher.get(v1_url, headers=headers)
+                if r.not_modified:
+                    return  # v1 lists the whole board at once, unchanged since the last run
+            if r.status_code != 200:
+                failures.append(f"{api}: {r.status_code}")
+                continue
+            remember('workable', org, api)
+            if api == 'v3':
+                # v3 pages with a cursor: each response carries the token for the next page
+                first = await parse(_workable_v3_page, r.content, company, org)
+                jobs = paginate(fetch_page, None, lambda d: d['results'], lambda d: d['total'],
+                                next_token_of=lambda d: d['nextPage'],
+                                first=Unchanged(first) if r.not_modified else first)
+                async for record in jobs:
+                    yield record
+            else:
+                for record in await parse(_workable_v1_records, r.content, company, org):
+                    yield record
+            return
+
+        forget('workable', org)
+        log_error(f"Workable API failed for {company} ({', '.join(failures)})")
+
+    except Exception as e:
+        log_error(f"Workable scraping failed for {company}: {e}")
+
+
+def _workable_v3_page(content, company, org):
+    data = json.loads(content)
+    records = []
+    for job in data.get('results', []):
+        title = job.get('title', '')
+        location_data = job.get('location', {})
+        city = location_data.get('city', 'N/A')
+        region = location_data.get('region', '')
+        location = f"{city}, {region}".strip(', ')
+        shortcode = job.get('shortcode')
+        link = f"https://apply.workable.com/{org}/j/{shortcode}/"
+
+        # Extract and format posted date
+        published_raw = job.get('published')
+        # posted_date = (
+        #     datetime.fromisoformat(published_raw.rstrip("Z")).strftime('%Y-%m-%d')
+        #     if published_raw else 'N/A'
+        # )
+
+        records.append(job_record(company, title, location, link, published_raw))
+    return {'total': data.get('total', 0), 'nextPage': data.get('nextPage'), 'results': records}
+
+
+def _workable_v1_records(content, company, org):
+    records = []
+    for job in json.loads(content):
+        title = job.get('title', '')
+        location = job.get('location', 'N/A')
+        shortcode = job.get('shortcode')
+        link = f"https://apply.workable.com/{org}/j/{shortcode}/"
+
+        published_raw = job.get('published')
+        # posted_date = (
+        #     datetime.fromisoformat(published_raw.rstrip("Z")).strftime('%Y-%m-%d')
+        #     if published_raw else 'N/A'
+        # )
+
+        records.append(job_record(company, title, location, link, published_raw))
+    return records
+
+
+async def scrape_workday(url, company):
+    # print(f"Scraping Workday for {company} (limited support)")
+    # try:
+    #     # Try to extract embedded job JSON data
+    #     r = requests.get(url)
+    #     soup = BeautifulSoup(r.text, 'html.parser')
+    #     script = soup.find('script', type='application/ld+json')
+    #     if script:
+    #         data = json.loads(script.string)
+    #         if isinstance(data, dict) and 'title' in data:
+    #             if any(k.lower() in data['title'].lower() for k in KEYWORDS):
+    #                 results.append({
+    #                     'company': company,
+    #                     'title': data['title'],
+    #                     'location': data.get('jobLocation', {}).get('address', {}).get('addressLocality', 'N/A'),
+    #                     'link': url
+    #                 })
+    # except Exception as e:
+    #     print(f"[ERROR] Workday scraping failed for {company}: {e}")
+
+    # print(f"Scraping Workday for {company}")
+    try:
+        # Match pattern: https://{sub}.wdX.myworkdayjobs.com/.../{site_id}
+        match = re.search(r'https://([\w\-]+)\.(wd\d+)\.myworkdayjobs\.com/(?:[\w\-]+/)?([\w\-]+)', url)
+        if not match:
+            log_error(f"Invalid Workday URL for {company}")
+            return
+
+        subdomain, wd_instance, site_id = match.group(1), match.group(2), match.group(3)
+        api_url = f"https://{subdomain}.{wd_instance}.myworkdayjobs.com/wday/cxs/{subdomain}/{site_id}/jobs"
+
+        # Workday caps a page at 20 postings
+        page_size = 20
+
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        }
+
+        async def fetch_page(offset, token):
+            payload = {
+                "appliedFacets": {},
+                "limit": page_size,
+                "offset": offset,
+                "searchText": ""
+            }
+            # The first page is always fetched whole: only it carries the real total
+            response = await fetcher.post(api_url, json=payload, headers=headers, conditional=offset > 0)
+            if response.not_modified and offset:
+                return None
+            if response.status_code != 200:
+                raise Exception(f"HTTP {response.status_code}: {response.text}")
+            page = await parse(_workday_page, response.content, company, subdomain, wd_instance, site_id)
+            return Unchanged(page) if response.not_modified else page
+
+        # Only the first page reports the real 'total'; later pages return 0
+        async for record in paginate(fetch_page, page_size, lambda d: d['jobPostings'], lambda d: d['total']):
+            yield record
+
+    except Exception as e:
+        log_error(f"Workday scraping failed for {company}: {e}")
+
+
+def _workday_page(content, company, subdomain, wd_instance, site_id):
+    data = json.loads(content)
+    records = []
+    for job in data.get('jobPostings', []):
+        title = job.get('title', '')
+        location = job.get('locationsText', 'N/A')
+        external_path = job.get('externalPath', '')
+        postedOn = job.get('postedOn', '')
+        link = f"https://{subdomain}.{wd_instance}.myworkdayjobs.com/en-US/{site_id}{external_path}"
+
+        records.append(job_record(company, title, location, link, postedOn))
+    return {'total': data.get('total', 0), 'jobPostings': records}
+
+
+# def scrape_jobvite(url, company):
+#     print(f"Scraping Jobvite for {company}")
+#     try:
+#         match = re.search(r'jobvite\.com/([^/]+)', url)
+#         if not match:
+#             print(f"[ERROR] Invalid Jobvite URL for {company}: {url}")
+#             return
+#         org = match.group(1)
+#         api_url = f"https://jobs.jobvite.com/api/v1/company/{org}/jobs"
+#
+#         r = requests.get(api_url)
+#         if r.status_code != 200:
+#             print(f"[ERROR] Jobvite API failed for {company}: HTTP {r.status_code} - {r.text}")
+#             return
+#
+#         print(r.text)
+        # for job in r.json():
+        #     title = job.get('title', '')
+        #     location = job.get('location', {}).get('city', 'N/A') + ', ' + job.get('location', {}).get('state', '')
+        #     link = job.get('jobUrl')
+        #     if keyword_match(title) and is_us_location(location) and link not in old_links:
+        #         results.append({
+        #             'company': company,
+        #             'title': title,
+        #             'location': location,
+        #             'link': link,
+        #             'postedOn': 'N/A'
+        #         })
+
+    # except Exception as e:
+    #     print(f"[ERROR] Jobvite scraping failed for {company}: {e}")
+
+
+async def scrape_generic(url, company):
+    # print(f"Scraping generic site for {company}")
+    try:
+        r = await fetcher.get(url)
+        if r.not_modified:
+            return
+        for record in await parse(_generic_records, r.content, url, company):
+            yield record
+    except Exception as e:
+        log_error(f"Generic scraping failed for {company}: {e}")
+
+
+def _generic_records(content, url, company):
+    return [job_record(company, title, None, urljoin(url, href)) for href, title in extract_links(content)]
+
+
+# Dispatcher
+dispatch_map = {
+    'greenhouse': scrape_greenhouse_json,
+    'lever': scrape_lever_json,
+    'ashby': scrape_ashby,
+    'ashbyhq_hosted': scrape_ashbyhq_hosted,
+    'workable': scrape_workable,
+    'workday': scrape_workday,
+    'generic': scrape_generic,
+    'breezy': scrape_breezy,
+    'smartrecruiters': scrape_smartrecruiters,
+    'recruiterbox': scrape_recruiterbox,
+    # 'jobvite': scrape_jobvite
+}
+
+# Rate limits per dispatch_map entry as (requests per second, burst), applied separately
+# to each API host -- for Workday that is one bucket per {tenant}.wdN.myworkdayjobs.com.
+# Platforms not listed here are only bounded by the fetcher's per-host concurrency.
+RATE_LIMITS = {
+    'workday': (0.5, 2),
+    'smartrecruiters': (5, 10),
+    'workable': (2, 4),
+}
@@ -0,0 +1,63 @@
+import csv
+import time
+
+from jobscraper.state import connect
+
+MIGRATION_BATCH = 5000
+
+
+class SeenLinks:
+    """SQLite-backed set of every posting link we've already reported.
+
+    Supports `link in seen` and `seen.add(link)` like the set it replaces, but membership
+    is a primary-key lookup, so nothing is loaded into memory at startup. New links are
+    buffered and written in one batch by flush() at the end of a run.
+    """
+
+    def __init__(self, path='seen_links.sqlite3'):
+        self.db = connect(path)
+        self.db.execute('CREATE TABLE IF NOT EXISTS seen (link TEXT PRIMARY KEY, first_seen REAL) WITHOUT ROWID')
+        self.db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self._pending = set()
+
+    def __contains__(self, link):
+        if link in self._pending:
+            return True
+        return self.db.execute('SELECT 1 FROM seen WHERE link = ?', (link,)).fetchone() is not None
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM seen').fetchone()[0] + len(self._pending)
+
+    def add(self, link):
+        self._pending.add(link)
+
+    def flush(self):
+        now = time.time()
+        with self.db:
+            self.db.executemany('INSERT OR IGNORE INTO seen VALUES (?, ?)', ((link, now) for link in self._pending))
+        self._pending.clear()
+
+    def migrate_csv(self, csv_path):
+        """One-time import of the links in an existing archive CSV; no-op once done."""
+        marker = f'migrated:{csv_path}'
+        if not csv_path.exists():
+            return 0
+        if self.db.execute('SELECT 1 FROM meta WHERE key = ?', (marker,)).fetchone():
+            return 0
+        now = time.time()
+        before = self.db.total_changes
+        with csv_path.open(newline='', encoding='utf-8') as f, self.db:
+            batch = []
+            for row in csv.DictReader(f):
+                if row.get('link'):
+                    batch.append((row['link'], now))
+                if len(batch) >= MIGRATION_BATCH:
+                    self.db.executemany('INSERT OR IGNORE INTO seen VALUES (?, ?)', batch)
+                    batch = []
+            self.db.executemany('INSERT OR IGNORE INTO seen VALUES (?, ?)', batch)
+            imported = self.db.total_changes - before
+            self.db.execute('INSERT INTO meta VALUES (?, ?)', (marker, str(now)))
+        return imported
+
+    def close(self):
+        self.db.close()
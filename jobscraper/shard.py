@@ -0,0 +1,108 @@
+import argparse
+import csv
+import hashlib
+import json
+import shutil
+import time
+
+from jobscraper.state import STATE_DIR
+
+# Per-shard results waiting to be merged, one directory per shard: shards/<i>-of-<N>/
+SHARDS_DIR = STATE_DIR / 'shards'
+DONE_MARKER = 'done.json'
+
+
+def parse_shard(text):
+    """argparse type for --shard: 'i/N' with 1 <= i <= N, returned as (i, N)."""
+    try:
+        index, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, e.g. 2/4, got '{text}'") from None
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {index} is outside 1..{count}")
+    return index, count
+
+
+def shard_of(row, count):
+    # Stable across runs and Python versions (unlike hash()), 1-based like --shard
+    key = f"{row['company']}\n{row['careers_url']}".encode()
+    return int.from_bytes(hashlib.sha1(key).digest()[:8], 'big') % count + 1
+
+
+def select_shard(companies, index, count):
+    return [row for row in companies if shard_of(row, count) == index]
+
+
+def shard_dir(index, count):
+    return SHARDS_DIR / f'{index}-of-{count}'
+
+
+class ShardSeen:
+    """Seen-links view for a shard run: checks the shared index but never writes to it.
+
+    Links the shard reports are only remembered for the run; the shard's output.csv is
+    its seen-link delta, folded into the shared index by merge_shards().
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.delta = set()
+
+    def __contains__(self, link):
+        return link in self.delta or link in self.base
+
+    def add(self, link):
+        self.delta.add(link)
+
+    def flush(self):
+        pass
+
+
+def start_shard(index, count):
+    """Clear what an earlier attempt at this shard left behind and return its directory."""
+    path = shard_dir(index, count)
+    shutil.rmtree(path, ignore_errors=True)
+    path.mkdir(parents=True)
+    return path
+
+
+def finish_shard(path, companies, written, caches):
+    """Mark the shard as done. `caches` maps a file name to a ResponseCache or
+    SnapshotStore: their updates are saved in the shard instead of being committed, since
+    the shard's postings only count as reported once merged. Re-running a finished shard
+    that was never merged therefore sees the same changes again."""
+    for name, cache in caches.items():
+        cache.dump_pending(path / name)
+    # Written last: merge_shards() only picks up shards that got this far
+    (path / DONE_MARKER).write_text(json.dumps({'companies': companies, 'written': written, 'finished': time.time()}))
+
+
+def merge_shards(writer, caches):
+    """Feed the output of every finished shard through `writer` and delete those shards.
+
+    The writer's seen index drops links another shard (or an earlier run) already
+    reported. The cache updates each shard saved (see finish_shard(), same `caches`) are
+    committed once the merged output is flushed. Returns (merged shard names, unfinished
+    shard names); unfinished ones are left in place to be re-run.
+
+    Shards read the seen index and caches of this state directory, so they have to have
+    run against it, not against a copy on another machine.
+    """
+    merged, unfinished = [], []
+    for path in sorted(SHARDS_DIR.glob('*-of-*')):
+        if not (path / DONE_MARKER).exists():
+            unfinished.append(path.name)
+            continue
+        with (path / 'output.csv').open(newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                writer.write(row)
+        for name, cache in caches.items():
+            if (path / name).exists():
+                cache.load_pending(path / name)
+        merged.append(path)
+    writer.flush(force=True)
+    for cache in caches.values():
+        cache.commit()
+    for path in merged:
+        shutil.rmtree(path)
+    return [path.name for path in merged], unfinished
@@ -0,0 +1,101 @@
+import hashlib
+import json
+
+from jobscraper.companies import board_key
+from jobscraper.pipeline import job_record
+from jobscraper.state import connect
+
+
+def fingerprint(record):
+    # What counts as a change to a posting that keeps its link
+    parts = (record['title'], record['location'], record['updatedOn'])
+    return hashlib.sha1('\x1f'.join('' if p is None else str(p) for p in parts).encode()).hexdigest()
+
+
+class BoardDiff:
+    """Diff of one board's matching postings against its snapshot from the last run.
+
+    classify() tags each posting as it is scraped; closed() lists the postings that
+    disappeared, and is only meaningful once the whole board was scraped.
+    """
+
+    def __init__(self, row, previous):
+        self.row = row
+        self.previous = previous
+        self.current = {}
+
+    def classify(self, record):
+        """Return 'new', 'updated', or None when the posting is unchanged."""
+        fp = fingerprint(record)
+        self.current[record['link']] = (fp, record['title'], record['location'], record['updatedOn'])
+        before = self.previous.get(record['link'])
+        if before is None:
+            return 'new'
+        return 'updated' if before[0] != fp else None
+
+    def closed(self):
+        closed = []
+        for link in self.previous.keys() - self.current.keys():
+            _, title, location, updated_on = self.previous[link]
+            closed.append(job_record(self.row['company'], title, location, link, updatedOn=updated_on,
+                                     change='closed'))
+        return closed
+
+
+class SnapshotStore:
+    """Per-board snapshot of the matching postings: link -> fingerprint of title, location
+    and updatedOn, plus what's needed to report a closed posting.
+
+    Each run diffs a board against its snapshot with set operations on the links, so
+    nothing is rescanned. New snapshots are held until commit(), which the caller runs
+    once the run's output is on disk (same reasoning as ResponseCache). `salt` ties a
+    snapshot to the filters it was taken with: after a filter change the first run
+    rebuilds snapshots instead of reporting every posting that stopped matching as closed.
+    """
+
+    def __init__(self, path='snapshots.sqlite3', salt=''):
+        self.db = connect(path)
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS postings ('
+            'board TEXT, link TEXT, fingerprint TEXT, title TEXT, location TEXT, updated_on TEXT, salt TEXT, '
+            'PRIMARY KEY (board, link)) WITHOUT ROWID'
+        )
+        self.salt = salt
+        self._pending = {}
+
+    def start(self, row):
+        cursor = self.db.execute(
+            'SELECT link, fingerprint, title, location, updated_on FROM postings WHERE board = ? AND salt = ?',
+            (board_key(row), self.salt),
+        )
+        return BoardDiff(row, {link: rest for link, *rest in cursor})
+
+    def finish(self, diff, complete):
+        """Queue the board's new snapshot. An incomplete scrape (errors, unchanged pages)
+        only adds to the old snapshot, since missing postings may still be listed."""
+        if not complete and not diff.current:
+            return
+        postings = diff.current if complete else {**diff.previous, **diff.current}
+        self._pending[board_key(diff.row)] = postings
+
+    def dump_pending(self, path):
+        # Same as ResponseCache.dump_pending(): shard runs leave the store to --merge
+        path.write_text(json.dumps({'salt': self.salt, 'boards': self._pending}))
+
+    def load_pending(self, path):
+        state = json.loads(path.read_text())
+        if state['salt'] == self.salt:
+            self._pending.update(state['boards'])
+
+    def commit(self):
+        with self.db:
+            for board, postings in self._pending.items():
+                self.db.execute('DELETE FROM postings WHERE board = ?', (board,))
+                self.db.executemany(
+                    'INSERT INTO postings VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    ((board, link, *values, self.salt) for link, values in postings.items()),
+                )
+        self._pending.clear()
+
+    def close(self):
+        self.db.close()
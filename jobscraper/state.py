@@ -0,0 +1,15 @@
+import sqlite3
+from pathlib import Path
+
+# Everything the scraper persists between runs (caches, indexes) lives here
+STATE_DIR = Path('.jobscraper')
+
+
+def connect(filename):
+    path = Path(filename)
+    if not path.is_absolute():
+        path = STATE_DIR / path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.execute('PRAGMA journal_mode=WAL')
+    return db
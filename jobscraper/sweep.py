@@ -0,0 +1,166 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from jobscraper.breaker import CircuitBreaker
+from jobscraper.capabilities import current_capabilities
+from jobscraper.companies import board_key
+from jobscraper.config import KEYWORDS, NO_KEYWORDS, WHOLE_WORD_KEYWORDS
+from jobscraper.fetch import Fetcher, current_fetcher
+from jobscraper.location import LocationClassifier
+from jobscraper.matching import TitleMatcher
+from jobscraper.metrics import CompanyMetrics, current_metrics, log_error
+from jobscraper.parsepool import ParsePool, current_filters, current_pool
+from jobscraper.pipeline import RecordCollector, run_pipeline
+from jobscraper.ratelimit import RateLimiter, current_platform
+from jobscraper.scrapers import RATE_LIMITS, dispatch_map
+
+
+class Filters:
+    """Title and location rules a posting has to pass to be reported."""
+
+    def __init__(self, keywords=KEYWORDS, no_keywords=NO_KEYWORDS, whole_words=WHOLE_WORD_KEYWORDS):
+        self.titles = TitleMatcher(keywords, no_keywords, whole_words)
+        self.locations = LocationClassifier()
+        # The arguments again, hashable and picklable: parse workers rebuild the filters from them
+        self.rules = (tuple(keywords), tuple(no_keywords), tuple(whole_words))
+        # Identifies this filter set, e.g. to invalidate cached boards when keywords change
+        self.fingerprint = json.dumps([list(keywords), list(no_keywords), list(whole_words)])
+
+    def keep(self, record):
+        # Postings without a location (or from boards that don't publish one) pass the US check
+        return self.titles.match(record['title']) and self.locations.is_us(record['location'])
+
+
+def _record_board_outcome(negative_cache, row, metrics):
+    if metrics.short_circuited:
+        # The host was down, not necessarily this board; don't hold it against the board
+        return
+    if metrics.errors and not metrics.postings_seen:
+        negative_cache.record_failure(row, metrics.errors[-1])
+    else:
+        negative_cache.record_success(row)
+
+
+async def scrape_company(row, filters, run_metrics=None, negative_cache=None, snapshots=None):
+    company = row['company']
+    url = row['careers_url']
+    platform = row['platform'].lower()
+    scraper = dispatch_map.get(platform)
+    if scraper:
+        if negative_cache is not None and negative_cache.should_skip(row):
+            print(f"[SKIP] {company} ({platform}): failed on recent runs, backing off (see the dead boards report)")
+            return
+        # Every request made below is paced by the RATE_LIMITS entry for this platform
+        current_platform.set(platform)
+        # Parsed pages come back with only the postings these keep (streamed ones don't)
+        current_filters.set(filters)
+        if run_metrics is not None:
+            metrics = run_metrics.start(company, platform, board_key(row))
+        else:
+            metrics = CompanyMetrics(company, platform)
+        current_metrics.set(metrics)
+        # With a snapshot store only new, updated and closed postings are passed on
+        diff = snapshots.start(row) if snapshots is not None else None
+        finished = False
+        try:
+            async for record in scraper(url, company):
+                metrics.postings_seen += 1
+                if filters.keep(record):
+                    metrics.postings_kept += 1
+                    if diff is not None:
+                        change = diff.classify(record)
+                        if change is None:
+                            continue
+                        # Without a snapshot to diff against (first run, new filters) a
+                        # posting is only new if its link is, not reopened
+                        record['change'] = change if diff.previous else None
+                    yield record
+            if diff is not None:
+                # Postings missing from the board are only closed if we saw all of it
+                complete = not (metrics.errors or metrics.short_circuited or metrics.not_modified)
+                if complete:
+                    for record in diff.closed():
+                        yield record
+                snapshots.finish(diff, complete)
+            finished = True
+        except Exception as e:
+            log_error(f"Exception in scraping {company} ({platform}): {e}")
+        finally:
+            metrics.finish()
+            cache = getattr(current_fetcher.get(), 'cache', None)
+            if cache is not None and (not finished or metrics.errors or metrics.short_circuited):
+                # Pages this board did fetch mustn't look unchanged next run while the
+                # postings on the pages it missed were never reported
+                cache.discard(metrics.cache_keys)
+            if negative_cache is not None:
+                _record_board_outcome(negative_cache, row, metrics)
+    else:
+        print(f"[WARN] Unsupported platform '{platform}' for {company}")
+
+
+@asynccontextmanager
+async def sweep_session(cache=None, rate_limits=RATE_LIMITS, breaker=None, parse_workers=0, capabilities=None,
+                        **fetcher_options):
+    """Open the fetcher (and parse pool) that scrape_company uses inside the block.
+
+    The I/O stage is sized by the fetcher options (max_connections, host_concurrency);
+    `parse_workers` > 0 adds that many worker processes for decoding large bodies (None:
+    one per CPU). A CapabilityCache as `capabilities` lets scrapers skip endpoint probing.
+    The daemon keeps one session open between polls so connections stay warm.
+    """
+    breaker = breaker or CircuitBreaker()
+    pool = ParsePool(parse_workers) if parse_workers != 0 else None
+    try:
+        async with Fetcher(limiter=RateLimiter(rate_limits), cache=cache, breaker=breaker,
+                           **fetcher_options) as fetcher:
+            current_fetcher.set(fetcher)
+            current_pool.set(pool)
+            current_capabilities.set(capabilities)
+            yield fetcher
+    finally:
+        if pool is not None:
+            pool.close()
+
+
+async def run_sweep(companies, writer, filters=None, cache=None, rate_limits=RATE_LIMITS, metrics=None,
+                    negative_cache=None, snapshots=None, costs=None, **session_options):
+    """Scrape every company row and stream the matching postings into `writer`.
+
+    Every company is scheduled at once; the fetcher's per-host pools decide how many
+    requests are actually in flight against each ATS. Pass a RunMetrics as `metrics` to
+    collect per-company request, latency and match statistics, a NegativeCache to skip
+    boards that keep failing, and a SnapshotStore to report updated and closed postings
+    besides new ones (commit it once the writer's output is safe). With a CostHistory as
+    `costs`, boards are started longest-first; the expected makespan goes into
+    `metrics.plan` and the run's durations into the history (commit it afterwards).
+    Other options go to sweep_session(). Returns the number of records the writer accepted.
+    """
+    filters = filters or Filters()
+    if costs is not None:
+        # Tasks start in this order, so it decides who queues first for connections,
+        # per-host slots and rate-limit tokens
+        companies, plan = costs.order(companies)
+        if metrics is not None:
+            metrics.plan = plan
+    async with sweep_session(cache, rate_limits, **session_options):
+        await run_pipeline((scrape_company(row, filters, metrics, negative_cache, snapshots) for row in companies),
+                           writer)
+    if metrics is not None:
+        metrics.finish()
+        if costs is not None:
+            costs.record(metrics)
+    return writer.written
+
+
+def scrape(companies, keywords=KEYWORDS, no_keywords=NO_KEYWORDS, whole_words=WHOLE_WORD_KEYWORDS, seen=None,
+           cache=None, rate_limits=RATE_LIMITS):
+    """Scrape `companies` and return the matching postings as a list of dicts.
+
+    `companies` is an iterable of mappings with 'company', 'careers_url' and 'platform'.
+    Links already in `seen` (any container supporting `in` and `add`, e.g. SeenLinks) are
+    skipped; by default postings are only deduplicated within this call.
+    """
+    collector = RecordCollector(seen)
+    asyncio.run(run_sweep(companies, collector, Filters(keywords, no_keywords, whole_words), cache, rate_limits))
+    return collector.records